@@ -4,12 +4,22 @@ import asyncio
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant
 
 from .client import SwegonCasaClient
-from .const import DOMAIN
+from .const import DOMAIN, FLEET
+from .coordinator import SwegonCasaDataUpdateCoordinator, async_remove_snapshot
+from .discovery import SwegonCasaDiscovery, async_remove_discovery
+from .fleet import SwegonCasaFleet
+from .lib import SwegonObjectId
+from .metadata import SwegonCasaMetadata, async_remove_metadata
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
@@ -24,47 +34,104 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     username = entry.data[CONF_USERNAME]
     password = entry.data[CONF_PASSWORD]
 
-    session = async_get_clientsession(hass)
-    client = SwegonCasaClient(host, username, password)
-    client.set_session(session)
+    if (fleet := hass.data[DOMAIN].get(FLEET)) is None:
+        fleet = hass.data[DOMAIN][FLEET] = SwegonCasaFleet()
 
-    try:
-        if not await client.login():
-            _LOGGER.error("Failed to login to Swegon Casa")
-            return False
-    except Exception as err:
-        _LOGGER.error("Error during login: %s", err)
-        return False
+    client = SwegonCasaClient(host, username, password)
+    client.create_session()
+
+    fleet.add_unit(entry.entry_id, client)
+
+    async def _async_close_client(_: Event) -> None:
+        """Close the client session when Home Assistant stops."""
+        await client.close()
+
+    entry.async_on_unload(client.close)
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close_client)
+    )
+
+    coordinator = SwegonCasaDataUpdateCoordinator(hass, entry, client, fleet)
+    discovery = SwegonCasaDiscovery(hass, entry.entry_id, client)
+    metadata = SwegonCasaMetadata(hass, entry.entry_id, client)
+
+    # With a saved snapshot the entities can show it right away, and nothing is
+    # read from the unit until the platforms are set up. Without one, the first
+    # poll logs in while the caches load, and raises ConfigEntryNotReady if it
+    # fails.
+    if restored := await coordinator.async_restore_snapshot():
+        objects = await discovery.async_load()
+    else:
+        _, objects = await asyncio.gather(
+            coordinator.async_config_entry_first_refresh(), discovery.async_load()
+        )
+
+    # Only cached metadata is loaded here; what is missing is read in the
+    # background, so an unreachable unit does not hold up the setup.
+    if objects is not None:
+        await metadata.async_load(objects, discovery.firmware)
 
     hass.data[DOMAIN][entry.entry_id] = {
         "client": client,
+        "coordinator": coordinator,
+        "discovery": discovery,
+        "metadata": metadata,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    async def async_fetch_data() -> None:
-        """Fetch data from device periodically."""
-        while True:
-            try:
-                data = await client.fetch_data()
-                if data:
-                    hass.bus.async_fire(
-                        f"{DOMAIN}_data_updated",
-                        {"data": data},
-                    )
-            except Exception as err:
-                _LOGGER.error("Error fetching data: %s", err)
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first poll {entry.title}"
+        )
 
-            await asyncio.sleep(30)
+    if objects is None or metadata.missing:
+        entry.async_create_background_task(
+            hass,
+            _async_discover(hass, entry, discovery, metadata),
+            f"{DOMAIN} discovery {entry.title}",
+        )
 
-    hass.create_task(async_fetch_data())
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+async def _async_discover(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    discovery: SwegonCasaDiscovery,
+    metadata: SwegonCasaMetadata,
+) -> None:
+    """Scan the unit and read the metadata of the objects found.
+
+    The entry is then reloaded if there are sensors to add for them.
+    """
+    set_up = metadata.sensor_descriptions(exclude=set(SwegonObjectId))
+    if (objects := await discovery.async_discover()) is None:
+        return
+
+    await metadata.async_load(objects, discovery.firmware)
+    await metadata.async_read_missing()
+    if metadata.sensor_descriptions(exclude=set(SwegonObjectId)) != set_up:
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id, None)
 
     return bool(unload_ok)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the data stored for a config entry."""
+    await async_remove_discovery(hass, entry.entry_id)
+    await async_remove_metadata(hass, entry.entry_id)
+    await async_remove_snapshot(hass, entry.entry_id)
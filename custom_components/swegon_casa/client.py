@@ -1,20 +1,106 @@
 """Swegon Casa client for Home Assistant."""
 
 import asyncio
-import json
+import contextlib
 import logging
-from collections.abc import Callable
-from typing import Any
+import ssl
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from http import HTTPStatus
+from typing import Any, TypeVar
 
 import aiohttp
+from aiohttp import hdrs
+
+from .codec import (
+    decode_response,
+    encode_properties_request,
+    encode_read_request,
+    encode_write_request,
+    extract_error,
+    extract_properties,
+    extract_values,
+)
+from .lib import OBJECTS_BY_ID, read_after_write_ids
+from .resilience import CircuitBreaker, RetryPolicy
+from .snapshot import SwegonCasaSnapshot
+from .stats import ClientStats, RequestKind
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+AUTH_REJECTED_STATUSES = (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN)
+
+DEFAULT_WRITE_COALESCE_WINDOW = 0.5
+
+# Give up quickly on connecting to a unit on the local network.
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+
+# Requests are sent as text, whether they were encoded to bytes or not.
+REQUEST_HEADERS = {hdrs.CONTENT_TYPE: "text/plain; charset=utf-8"}
+
+# The Smart Access module drops idle connections after a while; close ours first.
+KEEPALIVE_TIMEOUT = 10.0
+MAX_CONNECTIONS = 2
+
+# Objects read when the caller does not say which ones it needs.
+DEFAULT_READ_IDS = frozenset(OBJECTS_BY_ID)
+
+# Read sets whose encoded request is kept: the poll and a few read-backs.
+READ_REQUEST_CACHE_SIZE = 8
+
+# Consecutive dropped connections before keep-alive is given up on.
+FORCE_CLOSE_AFTER_DISCONNECTS = 3
+
+
+def _create_ssl_context() -> ssl.SSLContext:
+    """Create the SSL context for the device's self-signed certificate."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+SSL_CONTEXT = _create_ssl_context()
+
+
+class RequestRefusedError(Exception):
+    """The unit answered a request with a JSON-RPC error."""
+
+
+def _extract_values_or_raise(response: Any) -> dict[str, Any] | None:
+    """Extract the values of a read response, raising if the unit refused it."""
+    if (error := extract_error(response)) is not None:
+        raise RequestRefusedError(error)
+    return extract_values(response)
+
+
+class _PendingWrite:
+    """A write waiting for its coalescing window to pass."""
+
+    __slots__ = ("deadline", "task", "value")
+
+    task: asyncio.Task[bool]
+
+    def __init__(self, value: int, deadline: float):
+        """Initialize the pending write."""
+        self.value = value
+        self.deadline = deadline
+
 
 class SwegonCasaClient:
     """Client for Swegon Casa local API."""
 
-    def __init__(self, host: str, username: str, password: str):
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        write_coalesce_window: float = DEFAULT_WRITE_COALESCE_WINDOW,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
         """Initialize the client."""
         self.host = host
         self.username = username
@@ -22,15 +108,120 @@ class SwegonCasaClient:
         self.base_url = f"https://{host}"
         self.cookies: dict[str, str] = {}
         self.session: aiohttp.ClientSession | None = None
+        self.write_coalesce_window = write_coalesce_window
+        self.force_close = False
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.stats = ClientStats()
+
+        self._owns_session = False
+        self._disconnects = 0
+        self._in_flight: dict[aiohttp.ClientSession, int] = {}
+        self._replaced_sessions: set[aiohttp.ClientSession] = set()
+
+        self._authenticated = False
+        self._login_generation = 0
+        self._login_lock = asyncio.Lock()
+        self._pending_writes: dict[str, _PendingWrite] = {}
+        self._write_tasks: set[asyncio.Task[bool]] = set()
+        self._read_requests: dict[frozenset[str], bytes] = {}
 
         self._measurement_callback: Callable[[str, Any], None] | None = None
         self._mode_callback: Callable[[str, Any], None] | None = None
         self._setting_callback: Callable[[str, Any], None] | None = None
+        self._write_callback: Callable[[dict[str, int]], None] | None = None
+        self._read_back_callback: Callable[[dict[str, Any]], None] | None = None
 
     def set_session(self, session: aiohttp.ClientSession) -> None:
         """Set the aiohttp session."""
         self.session = session
 
+    @property
+    def authenticated(self) -> bool:
+        """Return whether the client holds a session the unit accepted."""
+        return self._authenticated
+
+    def create_session(self) -> aiohttp.ClientSession:
+        """Create a session of our own, tuned for the device.
+
+        The session has its own connection pool, keeping connections alive for
+        a little less than the device does, and its own cookie handling. If the
+        device keeps dropping connections, it is recreated with keep-alive off.
+        """
+        connector = aiohttp.TCPConnector(
+            ssl=SSL_CONTEXT,
+            limit=MAX_CONNECTIONS,
+            keepalive_timeout=None if self.force_close else KEEPALIVE_TIMEOUT,
+            force_close=self.force_close,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=REQUEST_TIMEOUT,
+        )
+        self._owns_session = True
+        return self.session
+
+    async def close(self) -> None:
+        """Cancel the coalesced writes and close the session the client created.
+
+        Writes still waiting for their coalescing window would otherwise be
+        sent on a closed session, or on the session of a reloaded entry.
+        """
+        for task in self._write_tasks:
+            task.cancel()
+        await asyncio.gather(*self._write_tasks, return_exceptions=True)
+
+        for session in self._replaced_sessions:
+            await session.close()
+        self._replaced_sessions.clear()
+
+        if self._owns_session and self.session:
+            await self.session.close()
+            self.session = None
+            self._owns_session = False
+
+    async def _handle_disconnect(self) -> None:
+        """Turn keep-alive off when the device keeps dropping connections.
+
+        The session is replaced at once, but the old one is only closed once the
+        requests still in flight on it are done.
+        """
+        self._disconnects += 1
+        if (
+            self._disconnects < FORCE_CLOSE_AFTER_DISCONNECTS
+            or self.force_close
+            or not self._owns_session
+        ):
+            return
+
+        _LOGGER.info(
+            "%s keeps dropping connections, no longer keeping them alive", self.host
+        )
+        self.force_close = True
+        old_session = self.session
+        self.create_session()
+        if old_session in self._in_flight:
+            self._replaced_sessions.add(old_session)
+        elif old_session:
+            await old_session.close()
+
+    @contextlib.asynccontextmanager
+    async def _use_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Use the current session, closing it after the last request if replaced."""
+        assert self.session is not None
+        session = self.session
+        self._in_flight[session] = self._in_flight.get(session, 0) + 1
+        try:
+            yield session
+        finally:
+            self._in_flight[session] -= 1
+            if not self._in_flight[session]:
+                del self._in_flight[session]
+                if session in self._replaced_sessions:
+                    self._replaced_sessions.discard(session)
+                    await session.close()
+
     def on_measurement(self, callback: Callable[[str, Any], None]) -> None:
         """Register measurement callback."""
         self._measurement_callback = callback
@@ -43,80 +234,220 @@ class SwegonCasaClient:
         """Register setting callback."""
         self._setting_callback = callback
 
+    def on_write(self, callback: Callable[[dict[str, int]], None]) -> None:
+        """Register callback for values written to the device."""
+        self._write_callback = callback
+
+    def on_read_back(self, callback: Callable[[dict[str, Any]], None]) -> None:
+        """Register callback for values read back after a write."""
+        self._read_back_callback = callback
+
     async def _make_request(
-        self, path: str, data: str | None = None
+        self, path: str, data: str | bytes, kind: RequestKind
     ) -> tuple[int, Any] | None:
         """Make HTTP request to the device."""
         if not self.session:
             _LOGGER.error("Session not set")
             return None
 
-        max_retries = 2
-        for attempt in range(max_retries):
+        stats = self.stats.requests[kind]
+        stats.requests += 1
+        if not self.circuit_breaker.allow_request():
+            _LOGGER.debug("Circuit open, not sending request to %s", self.host)
+            stats.failures += 1
+            return None
+
+        start = time.monotonic()
+        result = None
+        try:
+            result = await self._send_with_retries(path, data, kind)
+        finally:
+            stats.latency.add(time.monotonic() - start)
+            if result is None or result[0] >= HTTPStatus.BAD_REQUEST:
+                stats.failures += 1
+
+            if result is not None and result[0] < HTTPStatus.INTERNAL_SERVER_ERROR:
+                self.circuit_breaker.record_success()
+            else:
+                self.circuit_breaker.record_failure()
+
+        return result
+
+    async def _send_with_retries(
+        self, path: str, data: str | bytes, kind: RequestKind
+    ) -> tuple[int, Any] | None:
+        """Send a request, retrying timeouts, dropped connections and 5xx.
+
+        Every attempt is recorded in the request trace.
+        """
+        url = f"{self.base_url}{path}"
+        stats = self.stats.requests[kind]
+        policy = self.retry_policy
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        result = None
+        sent = 0
+        for attempt in range(policy.attempts):
+            if attempt:
+                delay = policy.delay(attempt - 1)
+                if loop.time() + delay - started > policy.deadline:
+                    break
+                await asyncio.sleep(delay)
+                stats.retries += 1
+
+            _LOGGER.debug("Making request to %s (attempt %d)", url, attempt + 1)
+            sent += 1
+            record = self.stats.start_attempt(kind, path, attempt + 1, len(data))
             try:
-                url = f"{self.base_url}{path}"
-                _LOGGER.debug("Making request to %s (attempt %d)", url, attempt + 1)
-
-                async with self.session.post(
-                    url,
-                    ssl=False,
-                    data=data,
-                    cookies=self.cookies,
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as response:
+                async with (
+                    self._use_session() as session,
+                    session.post(
+                        url,
+                        ssl=SSL_CONTEXT,
+                        data=data,
+                        headers=REQUEST_HEADERS,
+                        cookies=self.cookies,
+                        timeout=REQUEST_TIMEOUT,
+                    ) as response,
+                ):
+                    self._disconnects = 0
+
                     for cookie_name, cookie_value in response.cookies.items():
                         self.cookies[cookie_name] = cookie_value.value
 
-                    try:
-                        json_data = await response.json()
-                        return response.status, json_data
-                    except aiohttp.ContentTypeError:
-                        return response.status, None
+                    status = response.status
+                    if response.history and "login" in response.url.path:
+                        # An expired session is answered with a redirect to the
+                        # login page instead of an error status.
+                        status = HTTPStatus.UNAUTHORIZED
+
+                    body = await response.read()
+                    self.stats.finish_attempt(record, status, len(body))
+                    result = status, decode_response(body)
+                    if status < HTTPStatus.INTERNAL_SERVER_ERROR:
+                        return result
+
+                _LOGGER.debug("Server error %s (attempt %d)", status, attempt + 1)
             except aiohttp.ServerDisconnectedError as err:
                 _LOGGER.debug("Server disconnected (attempt %d): %s", attempt + 1, err)
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(0.5)
-                    continue
-                else:
-                    _LOGGER.error("Request error after retries: %s", err)
-                    return None
+                self.stats.finish_attempt(record, type(err).__name__)
+                await self._handle_disconnect()
+            except (TimeoutError, aiohttp.ClientConnectionError) as err:
+                _LOGGER.debug("Request failed (attempt %d): %r", attempt + 1, err)
+                self.stats.finish_attempt(record, type(err).__name__)
             except Exception as err:
                 _LOGGER.error("Request error: %s", err)
+                self.stats.finish_attempt(record, type(err).__name__)
                 return None
 
-        return None
+        if result is None:
+            _LOGGER.error("Request to %s failed after %d attempt(s)", url, sent)
+        return result
 
     async def login(self) -> bool:
         """Login to the device."""
         try:
             result = await self._make_request(
-                "/handle_login", f"username={self.username}&password={self.password}"
+                "/handle_login",
+                f"username={self.username}&password={self.password}",
+                RequestKind.LOGIN,
             )
 
             if result is None:
+                self._authenticated = False
                 return False
 
             status, _ = result
             if status != 200:
                 _LOGGER.error("Login failed with status %s", status)
+                self._authenticated = False
                 return False
 
             _LOGGER.debug("Login successful")
+            self._authenticated = True
+            self._login_generation += 1
             return True
 
         except Exception as err:
             _LOGGER.error("Login error: %s", err)
+            self._authenticated = False
             return False
 
-    async def fetch_data(self) -> dict[str, Any] | None:
-        """Fetch sensor data from the device."""
-        try:
-            success = await self.login()
-            if not success:
-                return None
+    async def _relogin(self, generation: int) -> bool:
+        """Log in again unless another caller already did since `generation`."""
+        async with self._login_lock:
+            if self._authenticated and self._login_generation != generation:
+                return True
+            return await self.login()
+
+    async def _request_api(
+        self, data: bytes, kind: RequestKind
+    ) -> tuple[int, Any] | None:
+        """Make an API request, logging in first only when needed.
 
-            payload = self._get_read_payload()
-            result = await self._make_request("/api", json.dumps(payload))
+        The session cookie is kept between calls. When the device rejects it,
+        log in again once and replay the request.
+        """
+        if not self._authenticated and not await self._relogin(self._login_generation):
+            return None
+
+        generation = self._login_generation
+        result = await self._make_request("/api", data, kind)
+        if result is None or result[0] not in AUTH_REJECTED_STATUSES:
+            return result
+
+        _LOGGER.debug("Session rejected with status %s, logging in again", result[0])
+        if not await self._relogin(generation):
+            return None
+
+        return await self._make_request("/api", data, kind)
+
+    async def fetch_data(
+        self, read_ids: Iterable[str] | None = None
+    ) -> SwegonCasaSnapshot | None:
+        """Fetch sensor data from the device.
+
+        Only the objects in `read_ids` are read, `DEFAULT_READ_IDS` if omitted.
+        """
+        values = await self._read(self._get_read_request(read_ids), extract_values)
+        if values is None:
+            return None
+        self.stats.record_snapshot()
+        return SwegonCasaSnapshot(values)
+
+    async def read_objects(self, object_ids: Iterable[str]) -> dict[str, Any] | None:
+        """Read property 85 of arbitrary objects, such as during discovery.
+
+        Objects that cannot be read are left out. Unlike `fetch_data`, the
+        request is not cached. Raises `RequestRefusedError` when the unit
+        refuses the request, as it does for more objects than it reads at once;
+        returns None when it did not answer.
+        """
+        return await self._read(
+            encode_read_request(object_ids), _extract_values_or_raise
+        )
+
+    async def read_properties(
+        self, object_ids: Iterable[str], properties: Iterable[str]
+    ) -> dict[str, dict[str, Any]] | None:
+        """Read several properties of the objects in one request.
+
+        Returns the values by object and property. Properties the unit does not
+        have, or objects it does not know, are left out.
+        """
+        return await self._read(
+            encode_properties_request(object_ids, properties), extract_properties
+        )
+
+    async def _read(
+        self,
+        request: bytes,
+        extract: Callable[[Any], _T | None],
+    ) -> _T | None:
+        """Send an encoded read request and return what `extract` takes from it."""
+        try:
+            result = await self._request_api(request, RequestKind.READ)
 
             if result is None:
                 _LOGGER.error("Fetch failed: no response")
@@ -127,107 +458,137 @@ class SwegonCasaClient:
                 _LOGGER.error("Fetch failed with status %s", status)
                 return None
 
-            result_obj = json_res.get("result", {}).get("objects", [])
-            sorted_data = {}
-
-            for item in result_obj:
-                item_id = item.get("id")
-                properties = item.get("properties", {})
-                measurement = properties.get("85")
-
-                if measurement:
-                    value = measurement.get("value")
-                    if value is not None:
-                        sorted_data[item_id] = value
-
-            return sorted_data
+            values = extract(json_res)
+            if values is None:
+                _LOGGER.error("Fetch failed: unexpected response %s", json_res)
+            return values
 
+        except RequestRefusedError:
+            raise
         except Exception as err:
             _LOGGER.error("Error fetching data: %s", err)
             return None
 
     async def set_value(self, object_id: str, value: int) -> bool:
-        """Set a value on the device."""
+        """Set a value on the device.
+
+        Writes to the same object that follow each other within
+        `write_coalesce_window` seconds collapse into one write of the last
+        value. Every caller gets the result of that write.
+        """
+        if self.write_coalesce_window <= 0:
+            results = await self.set_values({object_id: value})
+            return results[object_id]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.write_coalesce_window
+
+        if pending := self._pending_writes.get(object_id):
+            pending.value = value
+            pending.deadline = deadline
+        else:
+            pending = _PendingWrite(value, deadline)
+            self._pending_writes[object_id] = pending
+            pending.task = loop.create_task(self._write_coalesced(object_id, pending))
+            self._write_tasks.add(pending.task)
+            pending.task.add_done_callback(self._write_tasks.discard)
+
+        # The write runs in its own task so a cancelled caller cannot drop it.
+        return await asyncio.shield(pending.task)
+
+    async def _write_coalesced(self, object_id: str, pending: _PendingWrite) -> bool:
+        """Write the last value of a burst once its coalescing window passed."""
+        loop = asyncio.get_running_loop()
         try:
-            success = await self.login()
-            if not success:
-                return False
-
-            payload = self._get_write_payload(object_id, value)
-            result = await self._make_request("/api", json.dumps(payload))
+            while (delay := pending.deadline - loop.time()) > 0:
+                await asyncio.sleep(delay)
+        finally:
+            del self._pending_writes[object_id]
+
+        results = await self.set_values({object_id: pending.value})
+        return results[object_id]
+
+    async def set_values(self, values: dict[str, int]) -> dict[str, bool]:
+        """Set several values on the device in a single request.
+
+        Returns whether each object was written, so a partial failure can be
+        reported per object. The written objects and the objects depending on
+        them are then read back and passed to the read-back callback.
+        """
+        failed = dict.fromkeys(values, False)
+        try:
+            result = await self._request_api(
+                encode_write_request(values), RequestKind.WRITE
+            )
 
             if result is None:
-                _LOGGER.error("Set value failed: no response")
-                return False
+                _LOGGER.error("Set values failed: no response")
+                return failed
 
             status, json_res = result
             if status != 200:
-                _LOGGER.error("Set value failed with status %s", status)
-                return False
+                _LOGGER.error("Set values failed with status %s", status)
+                return failed
 
-            _LOGGER.debug("Set value response: %s", json_res)
-            return True
+            _LOGGER.debug("Set values response: %s", json_res)
+            results = self._parse_write_results(values, json_res)
 
-        except Exception as err:
-            _LOGGER.error("Error setting value: %s", err)
-            return False
+            written = {key: value for key, value in values.items() if results[key]}
+            if written and self._write_callback:
+                self._write_callback(written)
+            if written and self._read_back_callback:
+                await self._read_back(written)
+
+            return results
 
-    def _get_read_payload(self, read_ids: list[str] | None = None) -> dict[str, Any]:
-        """Create read payload."""
-        if read_ids is None:
-            read_ids = [
-                "17",
-                "18",
-                "19",
-                "22",
-                "23",
-                "27",
-                "28",
-                "29",
-                "31",
-                "121",
-                "163",
-                "111",
-                "153",
-                "154",
-                "200",
-                "201",
-            ]
-
-        objects = [
-            {"id": id, "properties": {"85": {}}, "device": 255} for id in read_ids
-        ]
-
-        return {
-            "jsonrpc": "2.0",
-            "id": 0,
-            "params": {
-                "objects": objects,
-            },
-            "method": "read",
-        }
+        except Exception as err:
+            _LOGGER.error("Error setting values: %s", err)
+            return failed
+
+    async def _read_back(self, written: dict[str, int]) -> None:
+        """Read the written objects and their dependents."""
+        assert self._read_back_callback is not None
+        request = self._get_read_request(read_after_write_ids(written))
+        values = await self._read(request, extract_values)
+        if values:
+            self._read_back_callback(values)
+
+    def _parse_write_results(
+        self, values: dict[str, int], json_res: Any
+    ) -> dict[str, bool]:
+        """Map a write response to a success flag per object."""
+        if not isinstance(json_res, dict):
+            return dict.fromkeys(values, True)
+
+        if error := json_res.get("error"):
+            _LOGGER.error("Set values rejected: %s", error)
+            return dict.fromkeys(values, False)
+
+        results = dict.fromkeys(values, True)
+        for item in json_res.get("result", {}).get("objects", []):
+            item_id = item.get("id")
+            if item_id not in results:
+                continue
+
+            properties = item.get("properties", {})
+            error = item.get("error") or properties.get("85", {}).get("error")
+            if error:
+                _LOGGER.error("Set value of object %s rejected: %s", item_id, error)
+                results[item_id] = False
+
+        return results
+
+    def _get_read_request(self, read_ids: Iterable[str] | None) -> bytes:
+        """Return the encoded read request, cached per set of IDs."""
+        read_ids = DEFAULT_READ_IDS if read_ids is None else frozenset(read_ids)
+        if (request := self._read_requests.get(read_ids)) is not None:
+            return request
+
+        if len(self._read_requests) >= READ_REQUEST_CACHE_SIZE:
+            del self._read_requests[next(iter(self._read_requests))]
+        request = self._read_requests[read_ids] = encode_read_request(read_ids)
+        return request
 
     async def set_climate_mode(self, _: int, new_mode: int) -> bool:
         """Set climate mode."""
         return await self.set_value("111", new_mode)
-
-    def _get_write_payload(self, write_id: str, write_value: int) -> dict[str, Any]:
-        """Create write payload."""
-        return {
-            "jsonrpc": "2.0",
-            "id": 0,
-            "params": {
-                "objects": [
-                    {
-                        "id": write_id,
-                        "properties": {
-                            "85": {
-                                "value": int(write_value),
-                            },
-                        },
-                        "device": 255,
-                    },
-                ],
-            },
-            "method": "write",
-        }
@@ -0,0 +1,161 @@
+"""Encoding and decoding of Swegon Casa JSON-RPC messages.
+
+Requests are assembled from pre-encoded byte fragments instead of building and
+serializing nested dicts on every call. Read requests only depend on the set
+of object IDs, so they are encoded once per read set.
+
+Responses are decoded from the raw body with orjson when it is installed, as
+it is alongside Home Assistant, and with the standard library otherwise. Values
+of known objects are converted to their data type while they are extracted.
+"""
+
+import json
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from .lib import VALUE_DECODERS
+
+_loads: Callable[[bytes], Any]
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover
+    _loads = json.loads
+
+DEVICE = 255
+
+_REQUEST_PREFIX = b'{"jsonrpc":"2.0","id":0,"params":{"objects":['
+_READ_SUFFIX = b']},"method":"read"}'
+_WRITE_SUFFIX = b']},"method":"write"}'
+
+_READ_OBJECT = b'{"id":%s,"properties":{"85":{}},"device":%d}'
+_PROPERTIES_OBJECT = b'{"id":%s,"properties":{%s},"device":%d}'
+_WRITE_OBJECT = b'{"id":%s,"properties":{"85":{"value":%d}},"device":%d}'
+
+# Encoded object and property IDs, quoted and escaped, by ID.
+_encoded_ids: dict[str, bytes] = {}
+
+
+def _encode_id(object_id: str) -> bytes:
+    """Return the JSON encoding of an object ID."""
+    try:
+        return _encoded_ids[object_id]
+    except KeyError:
+        encoded = _encoded_ids[object_id] = json.dumps(str(object_id)).encode()
+        return encoded
+
+
+def object_sort_key(object_id: str) -> tuple[int, str]:
+    """Sort numeric object IDs by number."""
+    return (int(object_id), "") if object_id.isdigit() else (0, object_id)
+
+
+def encode_read_request(read_ids: Iterable[str]) -> bytes:
+    """Encode a request reading property 85 of the objects, in ID order."""
+    return b"".join(
+        (
+            _REQUEST_PREFIX,
+            b",".join(
+                _READ_OBJECT % (_encode_id(object_id), DEVICE)
+                for object_id in sorted(read_ids, key=object_sort_key)
+            ),
+            _READ_SUFFIX,
+        )
+    )
+
+
+def encode_properties_request(
+    object_ids: Iterable[str], properties: Iterable[str]
+) -> bytes:
+    """Encode a request reading several properties of the objects."""
+    encoded_properties = b",".join(b"%s:{}" % _encode_id(prop) for prop in properties)
+    return b"".join(
+        (
+            _REQUEST_PREFIX,
+            b",".join(
+                _PROPERTIES_OBJECT % (_encode_id(object_id), encoded_properties, DEVICE)
+                for object_id in object_ids
+            ),
+            _READ_SUFFIX,
+        )
+    )
+
+
+def encode_write_request(values: dict[str, int]) -> bytes:
+    """Encode a request writing property 85 of the objects."""
+    return b"".join(
+        (
+            _REQUEST_PREFIX,
+            b",".join(
+                _WRITE_OBJECT % (_encode_id(object_id), int(value), DEVICE)
+                for object_id, value in values.items()
+            ),
+            _WRITE_SUFFIX,
+        )
+    )
+
+
+def decode_response(body: bytes) -> Any:
+    """Decode a response body, None if it is not JSON."""
+    try:
+        return _loads(body)
+    except ValueError:
+        return None
+
+
+def extract_error(response: Any) -> Any:
+    """Return the JSON-RPC error of a response, None if it has none."""
+    if not isinstance(response, dict):
+        return None
+    return response.get("error")
+
+
+def extract_values(response: Any) -> dict[str, Any] | None:
+    """Map each object of a read response to its property 85 value.
+
+    Values of objects in the registry are converted to their data type, others
+    are kept as sent. Objects without a value or with a value of the wrong type
+    are left out. Returns None when the response carries no objects at all.
+    """
+    try:
+        objects = response["result"]["objects"]
+    except (KeyError, TypeError):
+        return None
+
+    values = {}
+    decoders = VALUE_DECODERS
+    for item in objects:
+        try:
+            value = item["properties"]["85"]["value"]
+            if value is not None:
+                object_id = item["id"]
+                decoder = decoders.get(object_id)
+                values[object_id] = value if decoder is None else decoder(value)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return values
+
+
+def extract_properties(response: Any) -> dict[str, dict[str, Any]] | None:
+    """Map each object of a read response to the property values it returned.
+
+    Properties the unit returned an error for are left out. Returns None when
+    the response carries no objects at all.
+    """
+    try:
+        objects = response["result"]["objects"]
+    except (KeyError, TypeError):
+        return None
+
+    properties: dict[str, dict[str, Any]] = {}
+    for item in objects:
+        try:
+            properties[item["id"]] = {
+                prop: entry["value"]
+                for prop, entry in item["properties"].items()
+                if isinstance(entry, dict) and entry.get("value") is not None
+            }
+        except (KeyError, TypeError, AttributeError):
+            continue
+    return properties
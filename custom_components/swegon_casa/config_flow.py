@@ -6,10 +6,16 @@ from typing import Any
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .client import SwegonCasaClient
-from .const import DOMAIN
+from .const import (
+    CONF_MAX_POLL_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DOMAIN,
+    MIN_POLL_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +36,14 @@ class SwegonCasaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     domain = DOMAIN
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return SwegonCasaOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> Any:
         """Handle the initial step."""
         errors: dict[str, str] = {}
@@ -68,3 +82,34 @@ class SwegonCasaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
+
+
+class SwegonCasaOptionsFlow(config_entries.OptionsFlow):
+    """Handle Swegon Casa options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> Any:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        max_poll_interval = self._entry.options.get(
+            CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL.total_seconds()
+        )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MAX_POLL_INTERVAL, default=int(max_poll_interval)
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=int(MIN_POLL_INTERVAL.total_seconds())),
+                    ),
+                }
+            ),
+        )
@@ -1,58 +1,29 @@
 """Constants for the Swegon Casa integration."""
 
-from enum import StrEnum
+from datetime import timedelta
 from typing import Any
 
-DOMAIN = "swegon_casa"
-
-ID_TEMPERATURE_SUPPLY = "17"
-ID_TEMPERATURE_ROOM = "18"
-ID_TEMPERATURE_OUTSIDE = "19"
-ID_HUMIDITY_PERCENTAGE = "22"
-ID_HUMIDITY_GM3 = "23"
-ID_CURRENT_FAN_SPEED = "27"
-ID_VENTILATION_LEVEL_IN = "28"
-ID_VENTILATION_LEVEL_OUT = "29"
-ID_BOOST_COUNT_DOWN = "31"
-TRAVELLING_MODE_TEMPERATURE_DROP = "121"
-ID_SETPOINT_SUPPLY_TEMPERATURE = "163"
-
-ID_SET_MODE = "111"
-ID_MODE_AWAY = "1"
-ID_MODE_HOME = "2"
-ID_MODE_BOOST = "3"
-ID_MODE_OFF = "0"
-
-ID_SET_MODE_FIREPLACE = "153"
-ID_SET_MODE_TRAVEL = "154"
-
+from .lib import SwegonObjectId
 
-class ClimateMode(StrEnum):
-    """Climate modes."""
+DOMAIN = "swegon_casa"
 
-    AWAY = "away"
-    HOME = "home"
-    BOOST = "boost"
-    OFF = "off"
+FLEET = "fleet"
+METADATA_CACHES = "metadata_caches"
 
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
 
-MODE_MAPPINGS = {
-    "0": "Off",
-    "1": "Away",
-    "2": "Home",
-    "3": "Boost",
-}
+MIN_POLL_INTERVAL = timedelta(seconds=10)
+DEFAULT_MAX_POLL_INTERVAL = timedelta(minutes=5)
+POLL_INTERVAL_BACKOFF = 1.5
 
-CLIMATE_MODE_MAP = {
-    "away": ID_MODE_AWAY,
-    "home": ID_MODE_HOME,
-    "boost": ID_MODE_BOOST,
-    "off": ID_MODE_OFF,
-}
+SNAPSHOT_SAVE_DELAY = timedelta(minutes=1)
+SNAPSHOT_MAX_AGE = timedelta(days=1)
 
+# How often the request statistics sensors refresh, whether polls succeed or not.
+STATS_UPDATE_INTERVAL = timedelta(seconds=30)
 
 SENSOR_CONFIG: dict[str, dict[str, Any]] = {
-    ID_TEMPERATURE_SUPPLY: {
+    SwegonObjectId.TEMPERATURE_SUPPLY: {
         "key": "supply_temperature",
         "name": "FTX Supply Temperature",
         "device_class": "temperature",
@@ -60,7 +31,7 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": "measurement",
         "icon": "mdi:thermometer-chevron-up",
     },
-    ID_TEMPERATURE_ROOM: {
+    SwegonObjectId.TEMPERATURE_ROOM: {
         "key": "room_temperature",
         "name": "FTX Room Temperature",
         "device_class": "temperature",
@@ -68,7 +39,7 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": "measurement",
         "icon": "mdi:home-thermometer",
     },
-    ID_TEMPERATURE_OUTSIDE: {
+    SwegonObjectId.TEMPERATURE_OUTSIDE: {
         "key": "outside_temperature",
         "name": "FTX Outside Temperature",
         "device_class": "temperature",
@@ -76,7 +47,7 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": "measurement",
         "icon": "mdi:thermometer",
     },
-    ID_HUMIDITY_PERCENTAGE: {
+    SwegonObjectId.HUMIDITY_PERCENTAGE: {
         "key": "humidity_percentage",
         "name": "FTX Humidity",
         "device_class": "humidity",
@@ -84,7 +55,7 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": "measurement",
         "icon": "mdi:water-percent",
     },
-    ID_HUMIDITY_GM3: {
+    SwegonObjectId.HUMIDITY_ABSOLUTE: {
         "key": "humidity_absolute",
         "name": "FTX Absolute Humidity",
         "device_class": None,
@@ -92,7 +63,7 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": "measurement",
         "icon": "mdi:water",
     },
-    ID_CURRENT_FAN_SPEED: {
+    SwegonObjectId.CURRENT_FAN_SPEED: {
         "key": "fan_speed",
         "name": "FTX Fan Speed",
         "device_class": None,
@@ -100,7 +71,7 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": "measurement",
         "icon": "mdi:fan",
     },
-    ID_VENTILATION_LEVEL_IN: {
+    SwegonObjectId.VENTILATION_LEVEL_IN: {
         "key": "ventilation_level_in",
         "name": "FTX Ventilation Level In",
         "device_class": None,
@@ -108,7 +79,7 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": "measurement",
         "icon": "mdi:arrow-down-bold",
     },
-    ID_VENTILATION_LEVEL_OUT: {
+    SwegonObjectId.VENTILATION_LEVEL_OUT: {
         "key": "ventilation_level_out",
         "name": "FTX Ventilation Level Out",
         "device_class": None,
@@ -116,7 +87,7 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": "measurement",
         "icon": "mdi:arrow-up-bold",
     },
-    ID_BOOST_COUNT_DOWN: {
+    SwegonObjectId.BOOST_COUNTDOWN: {
         "key": "boost_countdown",
         "name": "FTX Boost Countdown",
         "device_class": "duration",
@@ -124,7 +95,7 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": "measurement",
         "icon": "mdi:timer",
     },
-    TRAVELLING_MODE_TEMPERATURE_DROP: {
+    SwegonObjectId.TRAVEL_MODE_TEMPERATURE_DROP: {
         "key": "travel_temp_drop",
         "name": "FTX Travel Mode Temperature Drop",
         "device_class": "temperature",
@@ -132,7 +103,7 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": "measurement",
         "icon": "mdi:thermometer-minus",
     },
-    ID_SETPOINT_SUPPLY_TEMPERATURE: {
+    SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE: {
         "key": "supply_temp_setpoint",
         "name": "FTX Supply Temperature Setpoint",
         "device_class": "temperature",
@@ -140,16 +111,15 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": "measurement",
         "icon": "mdi:thermometer-lines",
     },
-    ID_SET_MODE: {
+    SwegonObjectId.CLIMATE_MODE: {
         "key": "current_mode",
         "name": "FTX Current Mode",
-        "device_class": None,
+        "device_class": "enum",
         "unit_of_measurement": None,
         "state_class": None,
         "icon": "mdi:home-automation",
-        "options": ["Off", "Away", "Home", "Boost"],
     },
-    ID_SET_MODE_FIREPLACE: {
+    SwegonObjectId.FIREPLACE_MODE: {
         "key": "fireplace_mode",
         "name": "FTX Fireplace Mode",
         "device_class": None,
@@ -157,7 +127,7 @@ SENSOR_CONFIG: dict[str, dict[str, Any]] = {
         "state_class": None,
         "icon": "mdi:fireplace",
     },
-    ID_SET_MODE_TRAVEL: {
+    SwegonObjectId.TRAVEL_MODE: {
         "key": "travel_mode",
         "name": "FTX Travel Mode",
         "device_class": None,
@@ -0,0 +1,452 @@
+"""Data update coordinator for Swegon Casa."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .client import SwegonCasaClient
+from .const import (
+    CONF_MAX_POLL_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DOMAIN,
+    MIN_POLL_INTERVAL,
+    POLL_INTERVAL_BACKOFF,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_DELAY,
+)
+from .fleet import SwegonCasaFleet
+from .lib import POLL_DEADBANDS, VALUE_DECODERS, WRITABLE_IDS
+from .scheduler import AdaptivePollInterval, next_fixed_rate_tick
+from .snapshot import SwegonCasaSnapshot
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class _PendingValue:
+    """A written value shown before the unit confirmed it."""
+
+    __slots__ = ("acked_at", "previous", "value")
+
+    def __init__(self, value: Any, previous: Any) -> None:
+        """Initialize the pending value."""
+        self.value = value
+        self.previous = previous
+        self.acked_at: float | None = None
+
+
+class SwegonCasaDataUpdateCoordinator(DataUpdateCoordinator[SwegonCasaSnapshot]):
+    """Poll a Swegon Casa unit and push each snapshot to its entities.
+
+    Every snapshot is diffed against the previous one, see
+    `SwegonCasaSnapshot.changed`. Listeners registered with a context of object
+    IDs are only called back when one of those changed; listeners without a
+    context are called back on every poll.
+
+    Only the object IDs some listener renders are read, so disabled entities
+    cost nothing. Until a listener has subscribed, as on the first refresh, the
+    client's default set is read, and a listener subscribing to objects missing
+    from the snapshot requests a refresh.
+
+    Written values are shown right away. They stay pending until a read sent
+    after the unit acknowledged the write confirms them, or shows the unit kept
+    another value; reads sent earlier cannot overwrite them.
+
+    Every good snapshot is saved to disk, at most once per `SNAPSHOT_SAVE_DELAY`,
+    so a restart can show the last known values until the first poll is done.
+
+    The poll interval adapts to how fast the values change, see
+    `AdaptivePollInterval`. Polls run on a fixed-rate timeline the coordinator
+    keeps itself instead of the base class's timer, one at a time, and the
+    running poll is cancelled when the coordinator shuts down.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: SwegonCasaClient,
+        fleet: SwegonCasaFleet,
+    ) -> None:
+        """Initialize the coordinator."""
+        max_poll_interval = entry.options.get(
+            CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL.total_seconds()
+        )
+        self.poll_interval = AdaptivePollInterval(
+            MIN_POLL_INTERVAL.total_seconds(),
+            max_poll_interval,
+            POLL_INTERVAL_BACKOFF,
+            POLL_DEADBANDS,
+        )
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+        )
+        self.entry = entry
+        self.client = client
+        self.fleet = fleet
+        self.unit_key = entry.entry_id
+        self.skipped_ticks = 0
+        self._notified_success: bool | None = None
+        self._last_tick: float | None = None
+        self._tick_interval: float | None = None
+        self._next_tick: float | None = None
+        self._tick_handle: asyncio.TimerHandle | None = None
+        self._stopped = False
+        self._subscribers: dict[
+            CALLBACK_TYPE, tuple[CALLBACK_TYPE, frozenset[str] | None]
+        ] = {}
+        self._poll_lock = asyncio.Lock()
+        self._polls_started = 0
+        self._poll_task: asyncio.Task[None] | None = None
+        self._pending: dict[str, _PendingValue] = {}
+        self._read_back_started = 0.0
+        self._snapshot_store = _snapshot_store(hass, entry.entry_id)
+        self._snapshot_read_at: float | None = None
+        self._snapshot_save_scheduled = False
+
+        client.on_write(self._handle_write)
+        client.on_read_back(self._handle_read_back)
+
+    async def _async_update_data(self) -> SwegonCasaSnapshot:
+        """Fetch the latest snapshot from the device."""
+        read_started = self.hass.loop.time()
+        data = await self.fleet.fetch_data(self.unit_key, self.read_ids())
+        if data is None:
+            raise UpdateFailed("No data received from Swegon Casa")
+
+        if pending := self._resolve_pending(data, read_started):
+            data = data.replace(pending)
+        data = data.compared_to(self.data)
+
+        self.poll_interval.observe(data)
+        self._snapshot_read_at = time.time()
+        self._schedule_snapshot_save()
+        return data
+
+    async def async_restore_snapshot(self) -> bool:
+        """Show the snapshot saved last, unless it is too old."""
+        if (stored := await self._snapshot_store.async_load()) is None:
+            return False
+
+        age = time.time() - stored["read_at"]
+        if age > SNAPSHOT_MAX_AGE.total_seconds():
+            _LOGGER.debug("Saved snapshot of %s is too old to show", self.name)
+            return False
+
+        _LOGGER.debug("Restored snapshot of %s read %.0f seconds ago", self.name, age)
+        self.data = SwegonCasaSnapshot(stored["values"], time.monotonic() - age)
+        self._snapshot_read_at = stored["read_at"]
+        return True
+
+    @callback
+    def _schedule_snapshot_save(self) -> None:
+        """Save the snapshot once the save delay has passed."""
+        if self._snapshot_save_scheduled:
+            return
+
+        self._snapshot_save_scheduled = True
+        self._snapshot_store.async_delay_save(
+            self._snapshot_to_save, SNAPSHOT_SAVE_DELAY.total_seconds()
+        )
+
+    @callback
+    def _snapshot_to_save(self) -> dict[str, Any]:
+        """Return the snapshot to save with the time it was read."""
+        self._snapshot_save_scheduled = False
+        values = self.data.as_dict() if self.data is not None else {}
+        return {"read_at": self._snapshot_read_at, "values": values}
+
+    @callback
+    def read_ids(self) -> frozenset[str] | None:
+        """Return the object IDs the listeners render, None before any subscribed."""
+        contexts = list(self.async_contexts())
+        if not contexts:
+            return None
+        return frozenset().union(*contexts)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> CALLBACK_TYPE:
+        """Listen for data updates, reading objects missing from the snapshot.
+
+        Polling starts with the first listener and stops with the last one.
+        """
+        remove_base_listener = super().async_add_listener(update_callback, context)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener, stopping the polls after the last one."""
+            remove_base_listener()
+            self._subscribers.pop(remove_listener, None)
+            if not self._subscribers:
+                self._cancel_tick()
+
+        self._subscribers[remove_listener] = (update_callback, context)
+        if self._tick_handle is None and self._poll_task is None:
+            self._schedule_tick()
+        if context and self.data is not None and not self.data.keys() >= context:
+            self.hass.async_create_task(self.async_request_refresh())
+        return remove_listener
+
+    @callback
+    def _schedule_tick(self) -> None:
+        """Schedule the next poll on the fixed-rate timeline.
+
+        A new interval keeps the phase of the timeline. Ticks it passed
+        already are skipped, but only counted as missed polls when the
+        interval stayed the same.
+        """
+        self._cancel_tick()
+        if self._stopped or not self._subscribers or self.entry.pref_disable_polling:
+            return
+
+        loop = self.hass.loop
+        now = loop.time()
+        interval = self.poll_interval.interval
+        if self._last_tick is None:
+            self._last_tick = now + self.fleet.start_offset(self.unit_key)
+
+        next_tick, missed = next_fixed_rate_tick(self._last_tick, interval, now)
+        if missed and interval == self._tick_interval:
+            self.skipped_ticks += missed
+            _LOGGER.debug("Skipped %d missed poll(s) of %s", missed, self.name)
+        self._tick_interval = interval
+
+        self._next_tick = next_tick
+        self._tick_handle = loop.call_at(next_tick, self._handle_tick)
+
+    @callback
+    def _cancel_tick(self) -> None:
+        """Cancel the scheduled poll, if there is one."""
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+
+    @callback
+    def _handle_tick(self) -> None:
+        """Start the poll of a timeline tick."""
+        self._tick_handle = None
+        self._last_tick = self._next_tick
+        self._poll_task = self.entry.async_create_background_task(
+            self.hass, self._async_poll(), f"{DOMAIN} poll {self.entry.title}"
+        )
+
+    async def _async_poll(self) -> None:
+        """Run a scheduled poll, then schedule the next one."""
+        try:
+            await self.async_refresh()
+        finally:
+            self._poll_task = None
+            self._schedule_tick()
+
+    async def async_refresh(self) -> None:
+        """Refresh data, waiting for the poll running when called, if any.
+
+        That poll may have read the unit before the caller needed it to, so
+        another one runs after it. Callers waiting together share that poll.
+        """
+        requested = self._polls_started
+        async with self._poll_lock:
+            if self._polls_started > requested:
+                return
+            self._polls_started += 1
+            await super().async_refresh()
+
+    @property
+    def next_poll_in(self) -> float | None:
+        """Return the seconds until the next scheduled poll, if one is."""
+        if self._tick_handle is None or self._next_tick is None:
+            return None
+        now: float = self.hass.loop.time()
+        return max(0.0, self._next_tick - now)
+
+    @property
+    def poll_latency(self) -> float | None:
+        """Return how long the last poll took, including the fleet queue."""
+        return self.fleet.latencies.get(self.unit_key)
+
+    async def async_shutdown(self) -> None:
+        """Stop polling and cancel the running poll."""
+        await super().async_shutdown()
+        self._stopped = True
+        self._cancel_tick()
+        self.fleet.remove_unit(self.unit_key)
+        if self._poll_task and self._poll_task is not asyncio.current_task():
+            self._poll_task.cancel()
+        if self._snapshot_save_scheduled:
+            await self._snapshot_store.async_save(self._snapshot_to_save())
+
+    @callback
+    def _handle_write(self, values: dict[str, int]) -> None:
+        """Poll fast again after a value was written."""
+        now = self.hass.loop.time()
+        for object_id, value in values.items():
+            pending = self._pending.get(object_id)
+            if pending and pending.value == value:
+                pending.acked_at = now
+        self._read_back_started = now
+
+        self.poll_interval.notify_write()
+        if self._tick_handle is not None:
+            self._schedule_tick()
+
+    @callback
+    def _handle_read_back(self, values: dict[str, Any]) -> None:
+        """Merge values read back after a write and push the changed ones."""
+        if self.data is None:
+            return
+
+        if pending := self._resolve_pending(values, self._read_back_started):
+            values = {**values, **pending}
+        data = self.data.replace(values)
+        if data is not self.data:
+            self.async_set_updated_data(data)
+
+    async def async_write(self, values: dict[str, int]) -> bool:
+        """Write values to the unit, showing them until a read confirms them.
+
+        A single value goes through the client's write coalescing. Values the
+        unit did not take are rolled back at once. When the caller is cancelled
+        the write may still go through, so the next read decides instead.
+        """
+        if read_only := values.keys() - WRITABLE_IDS:
+            raise ValueError(f"Objects {sorted(read_only)} are not writable")
+
+        self._show_pending(values)
+        try:
+            if len(values) == 1:
+                [(object_id, value)] = values.items()
+                results = {object_id: await self.client.set_value(object_id, value)}
+            else:
+                results = await self.client.set_values(values)
+        except asyncio.CancelledError:
+            self._resolve_on_next_read(values)
+            raise
+        except Exception:
+            self._roll_back(values)
+            raise
+
+        self._roll_back(
+            {
+                object_id: values[object_id]
+                for object_id, written in results.items()
+                if not written
+            }
+        )
+        return all(results.values())
+
+    @callback
+    def _show_pending(self, values: dict[str, int]) -> None:
+        """Show written values until the unit confirms them."""
+        if self.data is None:
+            return
+
+        shown = {}
+        for object_id, value in values.items():
+            replaced = self._pending.get(object_id)
+            previous = replaced.previous if replaced else self.data.get(object_id)
+            pending = _PendingValue(VALUE_DECODERS[object_id](value), previous)
+            self._pending[object_id] = pending
+            shown[object_id] = pending.value
+
+        self._push(self.data.replace(shown))
+
+    @callback
+    def _resolve_on_next_read(self, values: dict[str, int]) -> None:
+        """Let the next read decide pending values of a write of unknown outcome."""
+        now = self.hass.loop.time()
+        for object_id, value in values.items():
+            pending = self._pending.get(object_id)
+            if pending and pending.value == value and pending.acked_at is None:
+                pending.acked_at = now
+
+    @callback
+    def _roll_back(self, values: dict[str, int]) -> None:
+        """Show the unit's values again for writes that failed."""
+        if self.data is None:
+            return
+
+        rolled_back = {}
+        for object_id, value in values.items():
+            pending = self._pending.get(object_id)
+            if pending is None or pending.value != value or pending.acked_at:
+                continue
+            del self._pending[object_id]
+            rolled_back[object_id] = pending.previous
+
+        if rolled_back:
+            _LOGGER.debug("Rolled back failed writes of %s", set(rolled_back))
+            self._push(self.data.replace(rolled_back))
+
+    @callback
+    def _resolve_pending(
+        self, values: Mapping[str, Any], read_started: float
+    ) -> dict[str, Any]:
+        """Confirm or roll back pending values with a read.
+
+        Only a read sent after the unit acknowledged the write decides; earlier
+        reads keep showing the pending value. Returns the pending values to show
+        instead of the values read.
+        """
+        shown = {}
+        for object_id, pending in list(self._pending.items()):
+            if object_id not in values:
+                continue
+
+            if pending.acked_at is None or read_started < pending.acked_at:
+                pending.previous = values[object_id]
+                shown[object_id] = pending.value
+                continue
+
+            del self._pending[object_id]
+            if values[object_id] != pending.value:
+                _LOGGER.debug(
+                    "Unit kept %s of object %s instead of %s",
+                    values[object_id],
+                    object_id,
+                    pending.value,
+                )
+        return shown
+
+    @callback
+    def _push(self, data: SwegonCasaSnapshot) -> None:
+        """Show data that was not read from the unit."""
+        if data is self.data:
+            return
+        self.data = data
+        self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose object IDs changed."""
+        changed = self.data.changed if self.data is not None else None
+        if changed is None or self.last_update_success != self._notified_success:
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._subscribers.values()):
+            if context is None or not changed.isdisjoint(context):
+                update_callback()
+
+
+def _snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the last snapshot of a unit."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot")
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the saved snapshot of a unit."""
+    await _snapshot_store(hass, entry_id).async_remove()
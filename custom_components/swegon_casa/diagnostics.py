@@ -0,0 +1,70 @@
+"""Diagnostics support for Swegon Casa."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .client import SwegonCasaClient
+from .const import DOMAIN
+from .coordinator import SwegonCasaDataUpdateCoordinator
+
+TO_REDACT = {CONF_HOST, CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    client: SwegonCasaClient = data["client"]
+    coordinator: SwegonCasaDataUpdateCoordinator = data["coordinator"]
+    stats = client.stats
+    breaker = client.circuit_breaker
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "scheduler": {
+            "poll_interval": coordinator.poll_interval.interval,
+            "min_poll_interval": coordinator.poll_interval.minimum,
+            "max_poll_interval": coordinator.poll_interval.maximum,
+            "next_poll_in": coordinator.next_poll_in,
+            "start_offset": coordinator.fleet.start_offset(coordinator.unit_key),
+            "skipped_ticks": coordinator.skipped_ticks,
+            "poll_latency": coordinator.poll_latency,
+            "last_update_success": coordinator.last_update_success,
+            "read_ids": sorted(coordinator.read_ids() or ()),
+        },
+        "client": {
+            "authenticated": client.authenticated,
+            "force_close": client.force_close,
+            "circuit": {
+                "state": breaker.state,
+                "failures": breaker.failures,
+                "open_timeout": breaker.open_timeout,
+            },
+            "requests": {
+                kind: {
+                    "requests": kind_stats.requests,
+                    "retries": kind_stats.retries,
+                    "failures": kind_stats.failures,
+                    "bytes_out": kind_stats.bytes_out,
+                    "bytes_in": kind_stats.bytes_in,
+                    "latency_p50": kind_stats.latency.percentile(50),
+                    "latency_p95": kind_stats.latency.percentile(95),
+                }
+                for kind, kind_stats in stats.requests.items()
+            },
+            "snapshot_age": stats.snapshot_age,
+        },
+        "trace": [record.as_dict() for record in stats.trace],
+        "snapshot": coordinator.data.as_dict() if coordinator.data else None,
+        "discovered_objects": data["discovery"].objects,
+        "firmware": data["metadata"].firmware,
+        "metadata": data["metadata"].objects,
+    }
@@ -0,0 +1,126 @@
+"""Discovery of the readable objects of a Swegon Casa unit."""
+
+import logging
+from collections.abc import Sequence
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .client import RequestRefusedError, SwegonCasaClient
+from .const import DOMAIN
+from .lib import FIRMWARE_OBJECT_ID, SwegonProperty
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Object IDs scanned for property 85.
+DISCOVERY_RANGE = range(1024)
+
+DEFAULT_BATCH_SIZE = 64
+MAX_BATCH_SIZE = 256
+
+
+async def async_scan_objects(
+    client: SwegonCasaClient,
+    object_ids: Sequence[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batch_size: int = MAX_BATCH_SIZE,
+) -> dict[str, Any] | None:
+    """Read every object in batches and return those with a property 85 value.
+
+    A batch the unit refuses is split in half and retried, and the batch size
+    grows back after every accepted batch. A single object the unit refuses is
+    skipped. Returns None when a request gets no answer, so a scan is never
+    left incomplete.
+    """
+    found: dict[str, Any] = {}
+    position = 0
+    while position < len(object_ids):
+        batch = object_ids[position : position + batch_size]
+        try:
+            values = await client.read_objects(batch)
+        except RequestRefusedError as err:
+            if len(batch) > 1:
+                batch_size = max(1, len(batch) // 2)
+                _LOGGER.debug(
+                    "Batch refused (%s), reading %d objects at once", err, batch_size
+                )
+                continue
+            _LOGGER.debug("Object %s cannot be read, skipping it", batch[0])
+        else:
+            if values is None:
+                _LOGGER.warning("Unit stopped answering, discovery aborted")
+                return None
+            found.update(values)
+            batch_size = min(max_batch_size, batch_size * 2)
+
+        position += len(batch)
+
+    return found
+
+
+async def async_read_firmware(client: SwegonCasaClient) -> str | None:
+    """Read the firmware revision of a unit, None if it did not answer."""
+    properties = await client.read_properties(
+        (FIRMWARE_OBJECT_ID,), (SwegonProperty.FIRMWARE_REVISION,)
+    )
+    if properties is None:
+        return None
+
+    firmware = properties.get(FIRMWARE_OBJECT_ID, {}).get(
+        SwegonProperty.FIRMWARE_REVISION
+    )
+    return str(firmware) if firmware is not None else None
+
+
+class SwegonCasaDiscovery:
+    """Readable objects and firmware revision of a unit, cached on disk.
+
+    `firmware` is None when the unit did not report it. That is cached with the
+    objects too, so the revision is only read once per scan.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, client: SwegonCasaClient
+    ) -> None:
+        """Initialize the discovery."""
+        self.client = client
+        self.objects: dict[str, Any] | None = None
+        self.firmware: str | None = None
+        self._store = _discovery_store(hass, entry_id)
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the readable objects if the unit was scanned before."""
+        if (cached := await self._store.async_load()) is not None:
+            self.objects = cached["objects"]
+            self.firmware = cached.get("firmware")
+        return self.objects
+
+    async def async_discover(self) -> dict[str, Any] | None:
+        """Return the readable objects, scanning the unit if not cached yet."""
+        if await self.async_load() is not None:
+            return self.objects
+
+        object_ids = [str(object_id) for object_id in DISCOVERY_RANGE]
+        _LOGGER.debug("Scanning %d objects of %s", len(object_ids), self.client.host)
+        objects = await async_scan_objects(self.client, object_ids)
+        if objects is None:
+            return None
+
+        _LOGGER.info("Discovered %d readable objects", len(objects))
+        self.objects = objects
+        self.firmware = await async_read_firmware(self.client)
+        await self._store.async_save({"objects": objects, "firmware": self.firmware})
+        return objects
+
+
+def _discovery_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the scan of a unit."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.discovery")
+
+
+async def async_remove_discovery(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the cached scan of a unit."""
+    await _discovery_store(hass, entry_id).async_remove()
@@ -0,0 +1,68 @@
+"""Base entity for Swegon Casa."""
+
+from abc import abstractmethod
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .client import SwegonCasaClient
+from .coordinator import SwegonCasaDataUpdateCoordinator
+from .snapshot import SwegonCasaSnapshot
+
+
+class SwegonCasaEntity(CoordinatorEntity[SwegonCasaDataUpdateCoordinator]):
+    """Swegon Casa entity updated from the coordinator snapshot.
+
+    The object IDs the entity renders are registered as the listener context,
+    so the coordinator only calls it back when one of them changed. Entities
+    without object IDs are called back on every poll.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: SwegonCasaDataUpdateCoordinator,
+        object_ids: Iterable[str] | None,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(
+            coordinator, frozenset(object_ids) if object_ids is not None else None
+        )
+        self.client: SwegonCasaClient = coordinator.client
+        self._written_state: tuple[Any, ...] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        if self.coordinator.data:
+            self._update_from_data(self.coordinator.data)
+        self._written_state = self._rendered_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self.coordinator.data:
+            self._update_from_data(self.coordinator.data)
+        self._async_write_changed_state()
+
+    @callback
+    def _async_write_changed_state(self) -> None:
+        """Write the state unless it is the one written last."""
+        rendered = self._rendered_state()
+        if rendered == self._written_state:
+            return
+
+        self._written_state = rendered
+        self.async_write_ha_state()
+
+    def _rendered_state(self) -> tuple[Any, ...]:
+        """Return what a state write would publish."""
+        return self.available, self.state, self.state_attributes
+
+    @callback
+    @abstractmethod
+    def _update_from_data(self, data: SwegonCasaSnapshot) -> None:
+        """Update entity attributes from a device snapshot."""
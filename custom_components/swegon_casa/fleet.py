@@ -0,0 +1,77 @@
+"""Fleet polling of many Swegon Casa units."""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Iterable
+
+from .client import SwegonCasaClient
+from .snapshot import SwegonCasaSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_STAGGER = 10.0
+
+
+class SwegonCasaFleet:
+    """Poll many Swegon Casa units with bounded parallelism.
+
+    Reads run concurrently, at most `max_concurrency` at a time. Each unit gets
+    a random start offset of up to `stagger` seconds so the units are not all
+    polled in the same second.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        stagger: float = DEFAULT_STAGGER,
+    ) -> None:
+        """Initialize the fleet."""
+        self.stagger = stagger
+        self.latencies: dict[str, float] = {}
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._clients: dict[str, SwegonCasaClient] = {}
+        self._offsets: dict[str, float] = {}
+
+    @property
+    def units(self) -> list[str]:
+        """Return the keys of the units in the fleet."""
+        return list(self._clients)
+
+    def add_unit(self, key: str, client: SwegonCasaClient) -> None:
+        """Add a unit to the fleet."""
+        self._clients[key] = client
+        self._offsets[key] = random.uniform(0, self.stagger)
+
+    def remove_unit(self, key: str) -> None:
+        """Remove a unit from the fleet."""
+        self._clients.pop(key, None)
+        self._offsets.pop(key, None)
+        self.latencies.pop(key, None)
+
+    def start_offset(self, key: str) -> float:
+        """Return how many seconds to delay the first poll of a unit."""
+        return self._offsets.get(key, 0.0)
+
+    async def fetch_data(
+        self, key: str, read_ids: Iterable[str] | None = None
+    ) -> SwegonCasaSnapshot | None:
+        """Poll one unit once a concurrency slot is free."""
+        client = self._clients[key]
+        async with self._semaphore:
+            start = time.monotonic()
+            data = await client.fetch_data(read_ids)
+            latency = time.monotonic() - start
+
+        self.latencies[key] = latency
+        _LOGGER.debug("Polled %s in %.3f seconds", client.host, latency)
+        return data
+
+    async def poll_all(self) -> dict[str, SwegonCasaSnapshot | None]:
+        """Poll every unit concurrently."""
+        keys = self.units
+        results = await asyncio.gather(*(self.fetch_data(key) for key in keys))
+        return dict(zip(keys, results, strict=True))
@@ -1,6 +1,8 @@
 """Swegon Casa library constants and types."""
 
+from collections.abc import Callable, Iterable
 from enum import StrEnum
+from typing import Any
 
 
 class MeasurementType(StrEnum):
@@ -82,6 +84,36 @@ class TravelModes(StrEnum):
     ON = "On"
 
 
+class ModeCodes:
+    """Codes the unit uses for the options of a mode object, looked up both ways.
+
+    The options are numbered in the order of their enum, from `first_code`.
+    """
+
+    __slots__ = ("_codes", "_options", "options")
+
+    def __init__(self, modes: type[StrEnum], first_code: int = 0) -> None:
+        """Number the options of a mode enum."""
+        self.options: tuple[str, ...] = tuple(mode.value for mode in modes)
+        self._options = dict(enumerate(self.options, first_code))
+        self._codes = {option: code for code, option in self._options.items()}
+
+    def option(self, code: Any) -> str | None:
+        """Return the option of a code, None if the code is unknown."""
+        return self._options.get(code)
+
+    def code(self, option: str) -> int:
+        """Return the code of an option."""
+        return self._codes[option]
+
+
+CLIMATE_MODE_CODES = ModeCodes(ClimateModes, first_code=1)
+AUTO_HUMIDITY_CONTROL_MODE_CODES = ModeCodes(AutoHumidityControlModes)
+SUMMER_NIGHT_COOLING_MODE_CODES = ModeCodes(SummerNightCoolingModes)
+FIREPLACE_MODE_CODES = ModeCodes(FireplaceModes)
+TRAVEL_MODE_CODES = ModeCodes(TravelModes)
+
+
 class SwegonObjectId(StrEnum):
     """Swegon Casa object IDs."""
 
@@ -101,3 +133,145 @@ class SwegonObjectId(StrEnum):
     SUMMER_NIGHT_COOLING_MODE = "201"
     FIREPLACE_MODE = "153"
     TRAVEL_MODE = "154"
+
+
+class SwegonProperty(StrEnum):
+    """Swegon Casa object properties, numbered as in BACnet."""
+
+    FIRMWARE_REVISION = "44"
+    MAX_VALUE = "65"
+    MIN_VALUE = "69"
+    OBJECT_NAME = "77"
+    PRESENT_VALUE = "85"
+    STATE_TEXT = "110"
+    UNITS = "117"
+
+
+class ObjectType(StrEnum):
+    """Data type of the value of an object."""
+
+    FLOAT = "float"
+    INT = "int"
+    MODE = "mode"
+
+
+class SwegonObject:
+    """Description of one object of the unit."""
+
+    __slots__ = ("codes", "deadband", "object_id", "scale", "type", "writable")
+
+    def __init__(
+        self,
+        object_id: SwegonObjectId,
+        type: ObjectType,
+        *,
+        scale: float = 1.0,
+        codes: ModeCodes | None = None,
+        writable: bool = False,
+        deadband: float | None = None,
+    ) -> None:
+        """Initialize the description.
+
+        `scale` converts the value the unit sends to its unit of measurement,
+        `codes` names the options of a mode object, and changes within
+        `deadband` do not count as activity for the poll interval.
+        """
+        self.object_id = object_id
+        self.type = type
+        self.scale = scale
+        self.codes = codes
+        self.writable = writable
+        self.deadband = deadband
+
+    def decoder(self) -> Callable[[Any], Any]:
+        """Return the function that converts a value the unit sent."""
+        if self.type is not ObjectType.FLOAT:
+            return int
+        if self.scale == 1.0:
+            return float
+        scale = self.scale
+        return lambda value: float(value) * scale
+
+
+OBJECTS: tuple[SwegonObject, ...] = (
+    SwegonObject(SwegonObjectId.TEMPERATURE_SUPPLY, ObjectType.FLOAT, deadband=0.3),
+    SwegonObject(SwegonObjectId.TEMPERATURE_ROOM, ObjectType.FLOAT, deadband=0.3),
+    SwegonObject(SwegonObjectId.TEMPERATURE_OUTSIDE, ObjectType.FLOAT, deadband=0.5),
+    SwegonObject(SwegonObjectId.HUMIDITY_PERCENTAGE, ObjectType.FLOAT, deadband=2.0),
+    SwegonObject(SwegonObjectId.HUMIDITY_ABSOLUTE, ObjectType.FLOAT, deadband=0.3),
+    SwegonObject(SwegonObjectId.CURRENT_FAN_SPEED, ObjectType.INT, deadband=50.0),
+    SwegonObject(SwegonObjectId.VENTILATION_LEVEL_IN, ObjectType.FLOAT, deadband=2.0),
+    SwegonObject(SwegonObjectId.VENTILATION_LEVEL_OUT, ObjectType.FLOAT, deadband=2.0),
+    SwegonObject(SwegonObjectId.BOOST_COUNTDOWN, ObjectType.INT),
+    SwegonObject(
+        SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE, ObjectType.FLOAT, writable=True
+    ),
+    SwegonObject(
+        SwegonObjectId.TRAVEL_MODE_TEMPERATURE_DROP, ObjectType.FLOAT, writable=True
+    ),
+    SwegonObject(
+        SwegonObjectId.CLIMATE_MODE,
+        ObjectType.MODE,
+        codes=CLIMATE_MODE_CODES,
+        writable=True,
+    ),
+    SwegonObject(
+        SwegonObjectId.AUTO_HUMIDITY_CONTROL_MODE,
+        ObjectType.MODE,
+        codes=AUTO_HUMIDITY_CONTROL_MODE_CODES,
+        writable=True,
+    ),
+    SwegonObject(
+        SwegonObjectId.SUMMER_NIGHT_COOLING_MODE,
+        ObjectType.MODE,
+        codes=SUMMER_NIGHT_COOLING_MODE_CODES,
+        writable=True,
+    ),
+    SwegonObject(
+        SwegonObjectId.FIREPLACE_MODE,
+        ObjectType.MODE,
+        codes=FIREPLACE_MODE_CODES,
+        writable=True,
+    ),
+    SwegonObject(
+        SwegonObjectId.TRAVEL_MODE,
+        ObjectType.MODE,
+        codes=TRAVEL_MODE_CODES,
+        writable=True,
+    ),
+)
+
+# Flat tables compiled from the registry for the hot paths.
+OBJECTS_BY_ID: dict[str, SwegonObject] = {obj.object_id: obj for obj in OBJECTS}
+VALUE_DECODERS: dict[str, Callable[[Any], Any]] = {
+    obj.object_id: obj.decoder() for obj in OBJECTS
+}
+WRITABLE_IDS = frozenset(obj.object_id for obj in OBJECTS if obj.writable)
+POLL_DEADBANDS: dict[str, float] = {
+    obj.object_id: obj.deadband for obj in OBJECTS if obj.deadband is not None
+}
+
+# Object whose firmware revision identifies the unit firmware. This is the
+# device object in BACnet terms; units that do not answer it share one cache.
+FIRMWARE_OBJECT_ID = "0"
+
+# Objects whose value the unit changes when another object is written.
+WRITE_DEPENDENTS: dict[str, frozenset[str]] = {
+    SwegonObjectId.CLIMATE_MODE: frozenset(
+        {
+            SwegonObjectId.BOOST_COUNTDOWN,
+            SwegonObjectId.TRAVEL_MODE,
+            SwegonObjectId.FIREPLACE_MODE,
+        }
+    ),
+    SwegonObjectId.TRAVEL_MODE: frozenset({SwegonObjectId.CLIMATE_MODE}),
+    SwegonObjectId.FIREPLACE_MODE: frozenset({SwegonObjectId.CLIMATE_MODE}),
+}
+
+
+def read_after_write_ids(written: Iterable[str]) -> frozenset[str]:
+    """Return the written objects and the objects that depend on them."""
+    read_ids = set(written)
+    for object_id in written:
+        read_ids |= WRITE_DEPENDENTS.get(object_id, frozenset())
+    return frozenset(read_ids)
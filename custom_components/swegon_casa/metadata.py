@@ -0,0 +1,207 @@
+"""Metadata of the objects of a Swegon Casa unit: names, units and limits."""
+
+import logging
+from collections.abc import Collection, Iterable
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    REVOLUTIONS_PER_MINUTE,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .client import SwegonCasaClient
+from .const import DOMAIN, METADATA_CACHES
+from .lib import SwegonProperty
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+METADATA_PROPERTIES = (
+    SwegonProperty.OBJECT_NAME,
+    SwegonProperty.UNITS,
+    SwegonProperty.MIN_VALUE,
+    SwegonProperty.MAX_VALUE,
+    SwegonProperty.STATE_TEXT,
+)
+
+# Objects whose metadata is read in one request.
+METADATA_BATCH_SIZE = 64
+
+# BACnet engineering units and the unit and device class they map to.
+BACNET_UNITS: dict[int, tuple[str, SensorDeviceClass | None]] = {
+    29: (PERCENTAGE, SensorDeviceClass.HUMIDITY),
+    62: (UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE),
+    71: (UnitOfTime.HOURS, SensorDeviceClass.DURATION),
+    72: (UnitOfTime.MINUTES, SensorDeviceClass.DURATION),
+    73: (UnitOfTime.SECONDS, SensorDeviceClass.DURATION),
+    98: (PERCENTAGE, None),
+    104: (REVOLUTIONS_PER_MINUTE, None),
+}
+
+
+class SwegonCasaMetadata:
+    """Metadata of the objects of a unit, cached on disk per firmware.
+
+    Units with the same firmware share one cache, kept in `hass.data` while
+    loaded, so the metadata of an object is only read from a unit once per
+    firmware revision and no unit saves over what another one read. A unit
+    whose firmware is unknown gets a cache of its own.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, client: SwegonCasaClient
+    ) -> None:
+        """Initialize the metadata."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.client = client
+        self.firmware: str | None = None
+        self.objects: dict[str, dict[str, Any]] = {}
+        self._object_ids: list[str] = []
+        self._cached: dict[str, dict[str, Any]] = {}
+        self._store: Store[dict[str, dict[str, Any]]] | None = None
+
+    @property
+    def missing(self) -> list[str]:
+        """Return the objects whose metadata was never read."""
+        return [
+            object_id for object_id in self._object_ids if object_id not in self._cached
+        ]
+
+    async def async_load(self, object_ids: Iterable[str], firmware: str | None) -> None:
+        """Load the cached metadata of the objects, without reading the unit."""
+        self.firmware = firmware
+        self._object_ids = list(object_ids)
+        if firmware is None:
+            self._store = _metadata_store(self.hass, self.entry_id)
+            self._cached = await self._store.async_load() or {}
+        else:
+            self._store = Store(
+                self.hass, STORAGE_VERSION, f"{DOMAIN}.metadata.{slugify(firmware)}"
+            )
+            self._cached = await self._async_shared_cache(firmware, self._store)
+        self._update_objects()
+
+    async def _async_shared_cache(
+        self, firmware: str, store: Store[dict[str, dict[str, Any]]]
+    ) -> dict[str, dict[str, Any]]:
+        """Return the cache the units with the firmware share, loading it once."""
+        caches: dict[str, dict[str, dict[str, Any]]] = self.hass.data.setdefault(
+            DOMAIN, {}
+        ).setdefault(METADATA_CACHES, {})
+        if (cached := caches.get(firmware)) is None:
+            loaded = await store.async_load() or {}
+            # Another unit may have loaded the cache while this one waited.
+            cached = caches.setdefault(firmware, loaded)
+        return cached
+
+    async def async_read_missing(self) -> None:
+        """Read the metadata missing from the cache from the unit and save it."""
+        if self._store is None or not (missing := self.missing):
+            return
+
+        _LOGGER.debug("Reading metadata of %d objects", len(missing))
+        if read := await self._async_read(missing):
+            self._cached.update(read)
+            await self._store.async_save(self._cached)
+            self._update_objects()
+
+    def _update_objects(self) -> None:
+        """Take the metadata of the objects from the cache."""
+        self.objects = {
+            object_id: self._cached[object_id]
+            for object_id in self._object_ids
+            if object_id in self._cached
+        }
+
+    async def _async_read(self, object_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Read the metadata of the objects in batches.
+
+        Objects without metadata are kept with an empty dict, so they are not
+        read again. Batches the unit did not answer are left out.
+        """
+        metadata: dict[str, dict[str, Any]] = {}
+        for start in range(0, len(object_ids), METADATA_BATCH_SIZE):
+            batch = object_ids[start : start + METADATA_BATCH_SIZE]
+            properties = await self.client.read_properties(batch, METADATA_PROPERTIES)
+            if properties is not None:
+                metadata.update(
+                    {object_id: properties.get(object_id, {}) for object_id in batch}
+                )
+        return metadata
+
+    def limits(self, object_id: str) -> tuple[float | None, float | None]:
+        """Return the minimum and maximum value of an object, if known."""
+        metadata = self.objects.get(object_id, {})
+        return (
+            metadata.get(SwegonProperty.MIN_VALUE),
+            metadata.get(SwegonProperty.MAX_VALUE),
+        )
+
+    def unit(self, object_id: str) -> str | None:
+        """Return the unit of measurement of an object, if it reports a known one."""
+        unit, _ = BACNET_UNITS.get(
+            self.objects.get(object_id, {}).get(SwegonProperty.UNITS, -1),
+            (None, None),
+        )
+        return unit
+
+    def sensor_descriptions(
+        self, exclude: Collection[str]
+    ) -> list[SensorEntityDescription]:
+        """Describe a sensor for each object with metadata, but the excluded."""
+        return [
+            _sensor_description(object_id, metadata)
+            for object_id, metadata in self.objects.items()
+            if metadata and object_id not in exclude
+        ]
+
+
+def _sensor_description(
+    object_id: str, metadata: dict[str, Any]
+) -> SensorEntityDescription:
+    """Describe a sensor of an object from its metadata."""
+    name = metadata.get(SwegonProperty.OBJECT_NAME) or f"Object {object_id}"
+    if state_text := metadata.get(SwegonProperty.STATE_TEXT):
+        return SensorEntityDescription(
+            key=object_id,
+            name=name,
+            device_class=SensorDeviceClass.ENUM,
+            options=list(state_text),
+            entity_registry_enabled_default=False,
+        )
+
+    unit, device_class = BACNET_UNITS.get(
+        metadata.get(SwegonProperty.UNITS, -1), (None, None)
+    )
+    return SensorEntityDescription(
+        key=object_id,
+        name=name,
+        device_class=device_class,
+        native_unit_of_measurement=unit,
+        state_class=SensorStateClass.MEASUREMENT if unit else None,
+        entity_registry_enabled_default=False,
+    )
+
+
+def _metadata_store(
+    hass: HomeAssistant, entry_id: str
+) -> Store[dict[str, dict[str, Any]]]:
+    """Return the metadata store of a unit whose firmware is unknown."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.metadata")
+
+
+async def async_remove_metadata(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the metadata stored for a unit whose firmware is unknown."""
+    await _metadata_store(hass, entry_id).async_remove()
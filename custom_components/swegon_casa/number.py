@@ -1,16 +1,17 @@
 """Number platform for Swegon Casa."""
 
-from typing import Any
-
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .client import SwegonCasaClient
 from .const import DOMAIN
+from .coordinator import SwegonCasaDataUpdateCoordinator
+from .entity import SwegonCasaEntity
 from .lib import SwegonObjectId
+from .metadata import SwegonCasaMetadata
+from .snapshot import SwegonCasaSnapshot
 
 
 async def async_setup_entry(
@@ -20,16 +21,17 @@ async def async_setup_entry(
 ) -> None:
     """Set up Swegon Casa number platform."""
     data = hass.data[DOMAIN][entry.entry_id]
-    client: SwegonCasaClient = data["client"]
+    coordinator: SwegonCasaDataUpdateCoordinator = data["coordinator"]
 
-    entity = SwegonCasaSupplyTemperatureSetpoint(hass, client, entry.entry_id)
+    entity = SwegonCasaSupplyTemperatureSetpoint(
+        coordinator, data["metadata"], entry.entry_id
+    )
     async_add_entities([entity])
 
 
-class SwegonCasaSupplyTemperatureSetpoint(NumberEntity):
+class SwegonCasaSupplyTemperatureSetpoint(SwegonCasaEntity, NumberEntity):
     """Swegon Casa supply temperature setpoint number."""
 
-    _attr_has_entity_name = True
     _attr_mode = NumberMode.BOX
     _attr_native_min_value = 15.0
     _attr_native_max_value = 30.0
@@ -38,38 +40,32 @@ class SwegonCasaSupplyTemperatureSetpoint(NumberEntity):
 
     def __init__(
         self,
-        hass: HomeAssistant,
-        client: SwegonCasaClient,
+        coordinator: SwegonCasaDataUpdateCoordinator,
+        metadata: SwegonCasaMetadata,
         entry_id: str,
     ) -> None:
         """Initialize the number entity."""
-        self.hass = hass
-        self.client = client
+        super().__init__(coordinator, (SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE,))
         self._attr_name = "Supply Temperature Setpoint"
         self._attr_unique_id = f"{DOMAIN}_{entry_id}_supply_temperature_setpoint"
-        self._attr_native_value = 20.0
+        self._attr_native_value: float | None = None
 
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        self.async_on_remove(
-            self.hass.bus.async_listen(
-                f"{DOMAIN}_data_updated",
-                self._handle_data_update,
-            )
-        )
+        minimum, maximum = metadata.limits(SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE)
+        if minimum is not None:
+            self._attr_native_min_value = float(minimum)
+        if maximum is not None:
+            self._attr_native_max_value = float(maximum)
 
     @callback
-    async def _handle_data_update(self, event: Any) -> None:
-        """Handle data update event."""
-        data = event.data.get("data", {})
-        setpoint_temp = data.get(str(SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE))
+    def _update_from_data(self, data: SwegonCasaSnapshot) -> None:
+        """Update the setpoint from a device snapshot."""
+        setpoint_temp = data.get(SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE)
 
         if setpoint_temp is not None:
-            self._attr_native_value = float(setpoint_temp)
-            self.async_write_ha_state()
+            self._attr_native_value = setpoint_temp
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the temperature setpoint."""
-        await self.client.set_value(
-            str(SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE), int(value)
+        await self.coordinator.async_write(
+            {SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE: int(value)}
         )
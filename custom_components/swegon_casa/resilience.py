@@ -0,0 +1,126 @@
+"""Retry policy and circuit breaker for requests to a Swegon Casa unit."""
+
+import logging
+import random
+import time
+from collections.abc import Callable
+from enum import StrEnum
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """Retry failed requests with exponential backoff and jitter.
+
+    The n-th retry waits `base_delay * 2 ** n`, capped at `max_delay`, with up
+    to `jitter` of it taken off at random so units that failed together do not
+    retry together. No retry is started once `deadline` seconds have passed
+    since the first attempt.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 4.0,
+        jitter: float = 0.5,
+        deadline: float = 20.0,
+    ) -> None:
+        """Initialize the policy."""
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+
+    def delay(self, retry: int) -> float:
+        """Return how long to wait before the given retry, counting from 0."""
+        delay: float = min(self.max_delay, self.base_delay * 2.0**retry)
+        return delay * (1 - self.jitter * random.random())
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop sending requests to a unit that keeps failing.
+
+    After `failure_threshold` failed requests in a row the circuit opens and
+    requests are refused without touching the network. Once `reset_timeout`
+    seconds have passed a single probe request is let through: if it succeeds
+    the circuit closes, otherwise it opens again for twice as long, up to
+    `max_reset_timeout`.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.open_timeout = reset_timeout
+
+        self._clock = clock
+        self._opened_at = 0.0
+
+    @property
+    def retry_at(self) -> float | None:
+        """Return when the next probe is let through, if the circuit is open."""
+        if self.state is not CircuitState.OPEN:
+            return None
+        return self._opened_at + self.open_timeout
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now."""
+        if self.state is CircuitState.CLOSED:
+            return True
+
+        if self.state is CircuitState.OPEN and self._clock() >= self._opened_at + (
+            self.open_timeout
+        ):
+            self.state = CircuitState.HALF_OPEN
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        if self.state is not CircuitState.CLOSED:
+            _LOGGER.info("Unit reachable again, closing circuit")
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.open_timeout = self.reset_timeout
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit when there are too many."""
+        self.failures += 1
+        if self.state is CircuitState.HALF_OPEN:
+            self.open_timeout = min(self.max_reset_timeout, self.open_timeout * 2)
+            self._open()
+        elif (
+            self.state is CircuitState.CLOSED
+            and self.failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        """Open the circuit."""
+        _LOGGER.info(
+            "Unit unreachable after %d failed requests, retrying in %.0f seconds",
+            self.failures,
+            self.open_timeout,
+        )
+        self.state = CircuitState.OPEN
+        self._opened_at = self._clock()
@@ -0,0 +1,83 @@
+"""Poll scheduling for Swegon Casa."""
+
+import math
+from collections.abc import Mapping
+from typing import Any
+
+
+def next_fixed_rate_tick(
+    last_tick: float, interval: float, now: float
+) -> tuple[float, int]:
+    """Return the next tick after `now` and how many ticks were missed.
+
+    Ticks lie on a timeline `interval` apart starting at `last_tick`, so a slow
+    poll does not push later polls off schedule. Ticks that already passed are
+    skipped rather than run back to back.
+    """
+    next_tick = last_tick + interval
+    if next_tick > now:
+        return next_tick, 0
+
+    missed = math.floor((now - next_tick) / interval) + 1
+    return next_tick + missed * interval, missed
+
+
+class AdaptivePollInterval:
+    """Poll interval that follows how fast the device values change.
+
+    Polls at `minimum` while any value moves beyond its deadband or right after
+    a write, and backs off geometrically towards `maximum` while every value
+    stays within its deadband of the last reading that moved.
+    """
+
+    def __init__(
+        self,
+        minimum: float,
+        maximum: float,
+        backoff: float = 1.5,
+        deadbands: Mapping[str, float] | None = None,
+    ) -> None:
+        """Initialize the poll interval."""
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.backoff = backoff
+        self.interval = minimum
+        self._deadbands = deadbands or {}
+        self._reference: dict[str, Any] | None = None
+
+    def observe(self, data: Mapping[str, Any]) -> float:
+        """Update the interval from a new snapshot and return it."""
+        if self._reference is None or self._is_changing(self._reference, data):
+            self._reference = dict(data)
+            self.interval = self.minimum
+        else:
+            self.interval = min(self.interval * self.backoff, self.maximum)
+
+        return self.interval
+
+    def notify_write(self) -> float:
+        """Poll fast again after a value was written."""
+        self.interval = self.minimum
+        return self.interval
+
+    def _is_changing(
+        self, reference: Mapping[str, Any], data: Mapping[str, Any]
+    ) -> bool:
+        """Return whether any value moved beyond its deadband."""
+        for object_id, value in data.items():
+            previous = reference.get(object_id)
+            if previous == value:
+                continue
+
+            # A value that appeared or disappeared always counts as a change.
+            if previous is not None and value is not None:
+                deadband = self._deadbands.get(object_id, 0.0)
+                try:
+                    if abs(float(value) - float(previous)) <= deadband:
+                        continue
+                except (TypeError, ValueError):
+                    pass
+
+            return True
+
+        return False
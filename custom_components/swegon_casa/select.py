@@ -1,361 +1,144 @@
 """Select platform for Swegon Casa."""
 
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from typing import Any
 
-from homeassistant.components.select import SelectEntity
+from homeassistant.components.select import SelectEntity, SelectEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .client import SwegonCasaClient
 from .const import DOMAIN
+from .coordinator import SwegonCasaDataUpdateCoordinator
+from .entity import SwegonCasaEntity
 from .lib import (
-    AutoHumidityControlModes,
+    AUTO_HUMIDITY_CONTROL_MODE_CODES,
+    CLIMATE_MODE_CODES,
+    FIREPLACE_MODE_CODES,
+    SUMMER_NIGHT_COOLING_MODE_CODES,
+    TRAVEL_MODE_CODES,
     ClimateModes,
-    FireplaceModes,
-    SummerNightCoolingModes,
+    ModeCodes,
     SwegonObjectId,
     TravelModes,
 )
+from .snapshot import SwegonCasaSnapshot
 
 
-async def async_setup_entry(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
-    async_add_entities: AddEntitiesCallback,
-) -> None:
-    """Set up Swegon Casa select platform."""
-    data = hass.data[DOMAIN][entry.entry_id]
-    client: SwegonCasaClient = data["client"]
-    entry_id = entry.entry_id
-
-    selects = [
-        SwegonCasaClimateSelect(hass, client, entry_id),
-        SwegonCasaFireplaceModeSelect(hass, client, entry_id),
-        SwegonCasaTravelModeSelect(hass, client, entry_id),
-        SwegonCasaAutoHumidityControlSelect(hass, client, entry_id),
-        SwegonCasaSummerNightCoolingSelect(hass, client, entry_id),
-    ]
-
-    async_add_entities(selects)
-
-
-class SwegonCasaClimateSelect(SelectEntity):
-    """Swegon Casa climate mode select."""
-
-    _attr_has_entity_name = True
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        client: SwegonCasaClient,
-        entry_id: str,
-    ) -> None:
-        """Initialize the select entity."""
-        self.hass = hass
-        self.client = client
-        self._attr_name = "Climate Mode"
-        self._attr_unique_id = f"{DOMAIN}_{entry_id}_climate_mode"
-        self._attr_current_option = ClimateModes.HOME
-        self._attr_options = [m.value for m in ClimateModes]
-
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        self.async_on_remove(
-            self.hass.bus.async_listen(
-                f"{DOMAIN}_data_updated",
-                self._handle_data_update,
-            )
-        )
-
-    @callback
-    async def _handle_data_update(self, event: Any) -> None:
-        """Handle data update event."""
-        data = event.data.get("data", {})
-        climate_mode_value = data.get(str(SwegonObjectId.CLIMATE_MODE))
-
-        if climate_mode_value is not None:
-            climate_modes_map = {
-                1: ClimateModes.AWAY,
-                2: ClimateModes.HOME,
-                3: ClimateModes.BOOST,
-                4: ClimateModes.TRAVEL,
-                5: ClimateModes.OFF,
-                6: ClimateModes.FIREPLACE,
-            }
-            self._attr_current_option = climate_modes_map.get(
-                int(climate_mode_value), ClimateModes.HOME
-            )
-            self.async_write_ha_state()
-
-    async def async_select_option(self, option: str) -> None:
-        """Select an option."""
-        climate_mode_map: dict[str, int] = {
-            ClimateModes.AWAY: 1,
-            ClimateModes.HOME: 2,
-            ClimateModes.BOOST: 3,
-            ClimateModes.TRAVEL: 4,
-            ClimateModes.OFF: 5,
-            ClimateModes.FIREPLACE: 6,
-        }
-
-        new_mode = climate_mode_map.get(option, 2)
-        await self.client.set_value(str(SwegonObjectId.CLIMATE_MODE), new_mode)
-
-
-class SwegonCasaFireplaceModeSelect(SelectEntity):
-    """Swegon Casa fireplace mode select."""
-
-    _attr_has_entity_name = True
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        client: SwegonCasaClient,
-        entry_id: str,
-    ) -> None:
-        """Initialize the select entity."""
-        self.hass = hass
-        self.client = client
-        self._attr_name = "Fireplace Mode"
-        self._attr_unique_id = f"{DOMAIN}_{entry_id}_fireplace_mode"
-        self._attr_current_option = FireplaceModes.OFF
-        self._attr_options = [m.value for m in FireplaceModes]
-
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        self.async_on_remove(
-            self.hass.bus.async_listen(
-                f"{DOMAIN}_data_updated",
-                self._handle_data_update,
-            )
-        )
-
-    @callback
-    async def _handle_data_update(self, event: Any) -> None:
-        """Handle data update event."""
-        data = event.data.get("data", {})
-        fireplace_mode_value = data.get(str(SwegonObjectId.FIREPLACE_MODE))
-
-        if fireplace_mode_value is not None:
-            fireplace_mode_map: dict[int, FireplaceModes] = {
-                0: FireplaceModes.OFF,
-                1: FireplaceModes.ON,
-            }
-            self._attr_current_option = fireplace_mode_map.get(
-                int(fireplace_mode_value), FireplaceModes.OFF
-            )
-            self.async_write_ha_state()
-
-    async def async_select_option(self, option: str) -> None:
-        """Select an option."""
-        fireplace_mode_reverse_map: dict[str, int] = {
-            FireplaceModes.OFF: 0,
-            FireplaceModes.ON: 1,
-        }
-
-        value = fireplace_mode_reverse_map.get(option, 0)
-        await self.client.set_value(str(SwegonObjectId.FIREPLACE_MODE), value)
+@dataclass(frozen=True, kw_only=True)
+class SwegonCasaSelectEntityDescription(SelectEntityDescription):
+    """Describes a select of a mode object."""
 
+    object_id: str
+    codes: ModeCodes
+    # Other objects the values written depend on.
+    depends_on: tuple[str, ...] = ()
+    # Values to write for a code, given the current snapshot.
+    write_fn: Callable[[int, Mapping[str, Any]], dict[str, int]] | None = None
 
-class SwegonCasaTravelModeSelect(SelectEntity):
-    """Swegon Casa travel mode select.
 
-    Note: Travel mode is only visible in the UI when BOTH conditions are met:
-    1. Climate mode is set to Travel (4)
-    2. Travel mode flag (154) is set to ON (1)
+def _travel_mode_values(code: int, data: Mapping[str, Any]) -> dict[str, int]:
+    """Return the values to write to turn travel mode on or off.
 
-    When turning on travel mode, the integration automatically sets the climate mode
-    to Travel if it's not already set. When turning off travel mode, the climate mode
-    is NOT automatically changed to preserve user preferences.
+    Travel mode only shows in the unit's UI when the climate mode is Travel as
+    well, so turning it on also sets the climate mode. Turning it off leaves the
+    climate mode as the user chose it.
     """
+    values: dict[str, int] = {}
+    travel_code = CLIMATE_MODE_CODES.code(ClimateModes.TRAVEL)
+    if (
+        code == TRAVEL_MODE_CODES.code(TravelModes.ON)
+        and data.get(SwegonObjectId.CLIMATE_MODE) != travel_code
+    ):
+        values[SwegonObjectId.CLIMATE_MODE] = travel_code
+    values[SwegonObjectId.TRAVEL_MODE] = code
+    return values
+
+
+SELECTS: tuple[SwegonCasaSelectEntityDescription, ...] = (
+    SwegonCasaSelectEntityDescription(
+        key="climate_mode",
+        name="Climate Mode",
+        object_id=SwegonObjectId.CLIMATE_MODE,
+        codes=CLIMATE_MODE_CODES,
+    ),
+    SwegonCasaSelectEntityDescription(
+        key="fireplace_mode",
+        name="Fireplace Mode",
+        object_id=SwegonObjectId.FIREPLACE_MODE,
+        codes=FIREPLACE_MODE_CODES,
+    ),
+    SwegonCasaSelectEntityDescription(
+        key="travel_mode",
+        name="Travel Mode",
+        object_id=SwegonObjectId.TRAVEL_MODE,
+        codes=TRAVEL_MODE_CODES,
+        depends_on=(SwegonObjectId.CLIMATE_MODE,),
+        write_fn=_travel_mode_values,
+    ),
+    SwegonCasaSelectEntityDescription(
+        key="auto_humidity_control_mode",
+        name="Auto Humidity Control Mode",
+        object_id=SwegonObjectId.AUTO_HUMIDITY_CONTROL_MODE,
+        codes=AUTO_HUMIDITY_CONTROL_MODE_CODES,
+    ),
+    SwegonCasaSelectEntityDescription(
+        key="summer_night_cooling_mode",
+        name="Summer Night Cooling Mode",
+        object_id=SwegonObjectId.SUMMER_NIGHT_COOLING_MODE,
+        codes=SUMMER_NIGHT_COOLING_MODE_CODES,
+    ),
+)
 
-    _attr_has_entity_name = True
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        client: SwegonCasaClient,
-        entry_id: str,
-    ) -> None:
-        """Initialize the select entity."""
-        self.hass = hass
-        self.client = client
-        self._attr_name = "Travel Mode"
-        self._attr_unique_id = f"{DOMAIN}_{entry_id}_travel_mode"
-        self._attr_current_option = TravelModes.OFF
-        self._attr_options = [m.value for m in TravelModes]
-        self._climate_mode: int | None = None
-
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        self.async_on_remove(
-            self.hass.bus.async_listen(
-                f"{DOMAIN}_data_updated",
-                self._handle_data_update,
-            )
-        )
-
-    @callback
-    async def _handle_data_update(self, event: Any) -> None:
-        """Handle data update event."""
-        data = event.data.get("data", {})
-        travel_mode_value = data.get(str(SwegonObjectId.TRAVEL_MODE))
-        self._climate_mode = data.get(str(SwegonObjectId.CLIMATE_MODE))
-
-        if travel_mode_value is not None:
-            travel_mode_map: dict[int, TravelModes] = {
-                0: TravelModes.OFF,
-                1: TravelModes.ON,
-            }
-            self._attr_current_option = travel_mode_map.get(
-                int(travel_mode_value), TravelModes.OFF
-            )
-            self.async_write_ha_state()
-
-    async def async_select_option(self, option: str) -> None:
-        """Select an option.
-
-        When turning ON travel mode, also sets climate mode to Travel (4).
-        """
-        travel_mode_reverse_map: dict[str, int] = {
-            TravelModes.OFF: 0,
-            TravelModes.ON: 1,
-        }
-
-        value = travel_mode_reverse_map.get(option, 0)
-
-        if value == 1 and self._climate_mode != 4:
-            await self.client.set_value(str(SwegonObjectId.CLIMATE_MODE), 4)
-
-        await self.client.set_value(str(SwegonObjectId.TRAVEL_MODE), value)
-
-
-class SwegonCasaAutoHumidityControlSelect(SelectEntity):
-    """Swegon Casa auto humidity control mode select."""
-
-    _attr_has_entity_name = True
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        client: SwegonCasaClient,
-        entry_id: str,
-    ) -> None:
-        """Initialize the select entity."""
-        self.hass = hass
-        self.client = client
-        self._attr_name = "Auto Humidity Control Mode"
-        self._attr_unique_id = f"{DOMAIN}_{entry_id}_auto_humidity_control_mode"
-        self._attr_current_option = AutoHumidityControlModes.OFF
-        self._attr_options = [m.value for m in AutoHumidityControlModes]
-
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        self.async_on_remove(
-            self.hass.bus.async_listen(
-                f"{DOMAIN}_data_updated",
-                self._handle_data_update,
-            )
-        )
-
-    @callback
-    async def _handle_data_update(self, event: Any) -> None:
-        """Handle data update event."""
-        data = event.data.get("data", {})
-        humidity_mode_value = data.get(str(SwegonObjectId.AUTO_HUMIDITY_CONTROL_MODE))
-
-        if humidity_mode_value is not None:
-            humidity_mode_map: dict[int, AutoHumidityControlModes] = {
-                0: AutoHumidityControlModes.OFF,
-                1: AutoHumidityControlModes.USER,
-                2: AutoHumidityControlModes.LOW,
-                3: AutoHumidityControlModes.NORMAL,
-                4: AutoHumidityControlModes.HIGH,
-                5: AutoHumidityControlModes.FULL,
-            }
-            self._attr_current_option = humidity_mode_map.get(
-                int(humidity_mode_value), AutoHumidityControlModes.OFF
-            )
-            self.async_write_ha_state()
 
-    async def async_select_option(self, option: str) -> None:
-        """Select an option."""
-        humidity_mode_reverse_map: dict[str, int] = {
-            AutoHumidityControlModes.OFF: 0,
-            AutoHumidityControlModes.USER: 1,
-            AutoHumidityControlModes.LOW: 2,
-            AutoHumidityControlModes.NORMAL: 3,
-            AutoHumidityControlModes.HIGH: 4,
-            AutoHumidityControlModes.FULL: 5,
-        }
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Swegon Casa select platform."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: SwegonCasaDataUpdateCoordinator = data["coordinator"]
 
-        value = humidity_mode_reverse_map.get(option, 0)
-        await self.client.set_value(
-            str(SwegonObjectId.AUTO_HUMIDITY_CONTROL_MODE), value
-        )
+    async_add_entities(
+        SwegonCasaSelect(coordinator, description, entry.entry_id)
+        for description in SELECTS
+    )
 
 
-class SwegonCasaSummerNightCoolingSelect(SelectEntity):
-    """Swegon Casa summer night cooling mode select."""
+class SwegonCasaSelect(SwegonCasaEntity, SelectEntity):
+    """Swegon Casa select of a mode object."""
 
-    _attr_has_entity_name = True
+    entity_description: SwegonCasaSelectEntityDescription
 
     def __init__(
         self,
-        hass: HomeAssistant,
-        client: SwegonCasaClient,
+        coordinator: SwegonCasaDataUpdateCoordinator,
+        description: SwegonCasaSelectEntityDescription,
         entry_id: str,
     ) -> None:
         """Initialize the select entity."""
-        self.hass = hass
-        self.client = client
-        self._attr_name = "Summer Night Cooling Mode"
-        self._attr_unique_id = f"{DOMAIN}_{entry_id}_summer_night_cooling_mode"
-        self._attr_current_option = SummerNightCoolingModes.OFF
-        self._attr_options = [m.value for m in SummerNightCoolingModes]
-
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        self.async_on_remove(
-            self.hass.bus.async_listen(
-                f"{DOMAIN}_data_updated",
-                self._handle_data_update,
-            )
-        )
+        super().__init__(coordinator, (description.object_id, *description.depends_on))
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{description.key}"
+        self._attr_current_option: str | None = None
+        self._attr_options = list(description.codes.options)
 
     @callback
-    async def _handle_data_update(self, event: Any) -> None:
-        """Handle data update event."""
-        data = event.data.get("data", {})
-        cooling_mode_value = data.get(str(SwegonObjectId.SUMMER_NIGHT_COOLING_MODE))
-
-        if cooling_mode_value is not None:
-            cooling_mode_map: dict[int, SummerNightCoolingModes] = {
-                0: SummerNightCoolingModes.OFF,
-                1: SummerNightCoolingModes.LOW,
-                2: SummerNightCoolingModes.NORMAL,
-                3: SummerNightCoolingModes.HIGH,
-                4: SummerNightCoolingModes.FULL,
-                5: SummerNightCoolingModes.USER,
-            }
-            self._attr_current_option = cooling_mode_map.get(
-                int(cooling_mode_value), SummerNightCoolingModes.OFF
-            )
-            self.async_write_ha_state()
+    def _update_from_data(self, data: SwegonCasaSnapshot) -> None:
+        """Update the selected option from a device snapshot."""
+        value = data.get(self.entity_description.object_id)
+        if value is not None:
+            self._attr_current_option = self.entity_description.codes.option(value)
 
     async def async_select_option(self, option: str) -> None:
         """Select an option."""
-        cooling_mode_reverse_map: dict[str, int] = {
-            SummerNightCoolingModes.OFF: 0,
-            SummerNightCoolingModes.LOW: 1,
-            SummerNightCoolingModes.NORMAL: 2,
-            SummerNightCoolingModes.HIGH: 3,
-            SummerNightCoolingModes.FULL: 4,
-            SummerNightCoolingModes.USER: 5,
-        }
-
-        value = cooling_mode_reverse_map.get(option, 0)
-        await self.client.set_value(
-            str(SwegonObjectId.SUMMER_NIGHT_COOLING_MODE), value
-        )
+        description = self.entity_description
+        code = description.codes.code(option)
+        if description.write_fn is None:
+            values = {description.object_id: code}
+        else:
+            values = description.write_fn(code, self.coordinator.data or {})
+
+        await self.coordinator.async_write(values)
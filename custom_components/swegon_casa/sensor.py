@@ -1,18 +1,124 @@
 """Sensor platform for Swegon Casa."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import StateType
+
+from .const import DOMAIN, SENSOR_CONFIG, STATS_UPDATE_INTERVAL
+from .coordinator import SwegonCasaDataUpdateCoordinator
+from .entity import SwegonCasaEntity
+from .lib import OBJECTS_BY_ID, ModeCodes, SwegonObjectId
+from .metadata import SwegonCasaMetadata
+from .snapshot import SwegonCasaSnapshot
+from .stats import ClientStats, RequestKind
+
+
+@dataclass(frozen=True, kw_only=True)
+class SwegonCasaStatSensorDescription(SensorEntityDescription):
+    """Describes a sensor of the client request statistics."""
+
+    value_fn: Callable[[ClientStats], StateType]
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    """Convert seconds to milliseconds."""
+    return None if seconds is None else seconds * 1000
+
+
+def _request_stat_descriptions(
+    kind: RequestKind,
+) -> tuple[SwegonCasaStatSensorDescription, ...]:
+    """Describe the statistics sensors of one kind of request."""
+    title = kind.capitalize()
+    return (
+        SwegonCasaStatSensorDescription(
+            key=f"{kind}_latency",
+            name=f"{title} Latency",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=0,
+            value_fn=lambda stats: _milliseconds(
+                stats.requests[kind].latency.percentile(50)
+            ),
+        ),
+        SwegonCasaStatSensorDescription(
+            key=f"{kind}_latency_p95",
+            name=f"{title} Latency P95",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=0,
+            value_fn=lambda stats: _milliseconds(
+                stats.requests[kind].latency.percentile(95)
+            ),
+        ),
+        SwegonCasaStatSensorDescription(
+            key=f"{kind}_requests",
+            name=f"{title} Requests",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            value_fn=lambda stats: stats.requests[kind].requests,
+        ),
+        SwegonCasaStatSensorDescription(
+            key=f"{kind}_retries",
+            name=f"{title} Retries",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            value_fn=lambda stats: stats.requests[kind].retries,
+        ),
+        SwegonCasaStatSensorDescription(
+            key=f"{kind}_failures",
+            name=f"{title} Failures",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            value_fn=lambda stats: stats.requests[kind].failures,
+        ),
+    )
+
 
-from .client import SwegonCasaClient
-from .const import (
-    DOMAIN,
-    ID_SET_MODE,
-    MODE_MAPPINGS,
-    SENSOR_CONFIG,
+STAT_SENSORS: tuple[SwegonCasaStatSensorDescription, ...] = (
+    *(
+        description
+        for kind in RequestKind
+        for description in _request_stat_descriptions(kind)
+    ),
+    SwegonCasaStatSensorDescription(
+        key="bytes_out",
+        name="Bytes Sent",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.bytes_out,
+    ),
+    SwegonCasaStatSensorDescription(
+        key="bytes_in",
+        name="Bytes Received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.bytes_in,
+    ),
+    SwegonCasaStatSensorDescription(
+        key="snapshot_age",
+        name="Snapshot Age",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda stats: stats.snapshot_age,
+    ),
 )
 
 
@@ -23,39 +129,54 @@ async def async_setup_entry(
 ) -> None:
     """Set up Swegon Casa sensor platform."""
     data = hass.data[DOMAIN][entry.entry_id]
-    client: SwegonCasaClient = data["client"]
+    coordinator: SwegonCasaDataUpdateCoordinator = data["coordinator"]
 
-    sensors = []
+    metadata: SwegonCasaMetadata = data["metadata"]
+
+    sensors: list[SensorEntity] = []
     for sensor_id, config in SENSOR_CONFIG.items():
         sensors.append(
             SwegonCasaSensor(
-                client,
-                hass,
+                coordinator,
                 sensor_id,
                 config,
                 entry.entry_id,
+                metadata.unit(sensor_id),
             )
         )
 
+    sensors.append(SwegonCasaPollIntervalSensor(coordinator, entry.entry_id))
+    sensors.append(SwegonCasaPollLatencySensor(coordinator, entry.entry_id))
+    sensors.extend(
+        SwegonCasaStatSensor(coordinator, description, entry.entry_id)
+        for description in STAT_SENSORS
+    )
+
+    sensors.extend(
+        SwegonCasaObjectSensor(coordinator, description, entry.entry_id)
+        for description in metadata.sensor_descriptions(exclude=set(SwegonObjectId))
+    )
+
     async_add_entities(sensors)
 
 
-class SwegonCasaSensor(SensorEntity):
+class SwegonCasaSensor(SwegonCasaEntity, SensorEntity):
     """Swegon Casa sensor entity."""
 
-    _attr_has_entity_name = True
-
     def __init__(
         self,
-        client: SwegonCasaClient,
-        hass: HomeAssistant,
+        coordinator: SwegonCasaDataUpdateCoordinator,
         sensor_id: str,
         config: dict[str, Any],
         entry_id: str,
+        unit: str | None = None,
     ) -> None:
-        """Initialize the sensor entity."""
-        self.client = client
-        self.hass = hass
+        """Initialize the sensor entity.
+
+        `unit` is the unit of measurement the unit reports for the object, which
+        takes precedence over the configured one for measured objects.
+        """
+        super().__init__(coordinator, (sensor_id,))
         self.sensor_id = sensor_id
         self._attr_name = config["name"]
         self._attr_unique_id = f"{DOMAIN}_{entry_id}_{sensor_id}"
@@ -65,7 +186,9 @@ class SwegonCasaSensor(SensorEntity):
             self._attr_device_class = config["device_class"]
 
         if config["unit_of_measurement"]:
-            self._attr_native_unit_of_measurement = config["unit_of_measurement"]
+            self._attr_native_unit_of_measurement = (
+                unit or config["unit_of_measurement"]
+            )
 
         if config["state_class"]:
             self._attr_state_class = config["state_class"]
@@ -73,25 +196,156 @@ class SwegonCasaSensor(SensorEntity):
         if "icon" in config:
             self._attr_icon = config["icon"]
 
+        # Enum sensors of mode objects show the name of the option.
+        self._codes: ModeCodes | None = None
+        if config["device_class"] == SensorDeviceClass.ENUM:
+            self._codes = OBJECTS_BY_ID[sensor_id].codes
+            if self._codes is not None:
+                self._attr_options = list(self._codes.options)
+
+    @callback
+    def _update_from_data(self, data: SwegonCasaSnapshot) -> None:
+        """Update the sensor value from a device snapshot."""
+        if self.sensor_id in data:
+            value = data[self.sensor_id]
+
+            if self._codes is not None:
+                value = self._codes.option(value)
+
+            self._attr_native_value = value
+
+
+class SwegonCasaPollIntervalSensor(SwegonCasaEntity, SensorEntity):
+    """Current effective poll interval of the coordinator."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_icon = "mdi:timer-sync-outline"
+
+    def __init__(
+        self,
+        coordinator: SwegonCasaDataUpdateCoordinator,
+        entry_id: str,
+    ) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(coordinator, None)
+        self._attr_name = "Poll Interval"
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_poll_interval"
+
+    @callback
+    def _update_from_data(self, data: SwegonCasaSnapshot) -> None:
+        """Update the interval after a poll."""
+        self._attr_native_value = round(self.coordinator.poll_interval.interval)
+
+
+class SwegonCasaPollLatencySensor(SwegonCasaEntity, SensorEntity):
+    """How long the last poll took, including waiting for a fleet slot."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(
+        self,
+        coordinator: SwegonCasaDataUpdateCoordinator,
+        entry_id: str,
+    ) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(coordinator, None)
+        self._attr_name = "Poll Latency"
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_poll_latency"
+
+    @callback
+    def _update_from_data(self, data: SwegonCasaSnapshot) -> None:
+        """Update the latency after a poll."""
+        if (latency := self.coordinator.poll_latency) is not None:
+            self._attr_native_value = round(latency * 1000)
+
+
+class SwegonCasaStatSensor(SwegonCasaEntity, SensorEntity):
+    """Request statistics of the client, disabled by default."""
+
+    entity_description: SwegonCasaStatSensorDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: SwegonCasaDataUpdateCoordinator,
+        description: SwegonCasaStatSensorDescription,
+        entry_id: str,
+    ) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(coordinator, None)
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{description.key}"
+
+    @property
+    def available(self) -> bool:
+        """Return True, statistics are also kept while the unit is unreachable."""
+        return True
+
     async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
+        """Refresh the statistic on a timer as well.
+
+        The coordinator stops calling back while polls keep failing, which is
+        when the failure and retry counts move.
+        """
+        self._update_from_data(self.coordinator.data)
+        await super().async_added_to_hass()
         self.async_on_remove(
-            self.hass.bus.async_listen(
-                f"{DOMAIN}_data_updated",
-                self._handle_data_update,
+            async_track_time_interval(
+                self.hass, self._async_refresh, STATS_UPDATE_INTERVAL
             )
         )
 
     @callback
-    def _handle_data_update(self, event: Any) -> None:
-        """Handle data update from device."""
-        data = event.data.get("data", {})
+    def _async_refresh(self, _now: datetime) -> None:
+        """Update the statistic between polls."""
+        self._handle_coordinator_update()
 
-        if self.sensor_id in data:
-            value = data[self.sensor_id]
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the statistic, also while the coordinator holds no snapshot."""
+        self._update_from_data(self.coordinator.data)
+        self._async_write_changed_state()
 
-            if self.sensor_id == ID_SET_MODE:
-                value = MODE_MAPPINGS.get(str(value), f"Unknown({value})")
+    @callback
+    def _update_from_data(self, data: SwegonCasaSnapshot | None) -> None:
+        """Update the statistic from the client."""
+        self._attr_native_value = self.entity_description.value_fn(self.client.stats)
 
-            self._attr_native_value = value
-            self.async_write_ha_state()
+
+class SwegonCasaObjectSensor(SwegonCasaEntity, SensorEntity):
+    """Object the integration has no dedicated entity for, described by the unit.
+
+    These are disabled by default.
+    """
+
+    def __init__(
+        self,
+        coordinator: SwegonCasaDataUpdateCoordinator,
+        description: SensorEntityDescription,
+        entry_id: str,
+    ) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(coordinator, (description.key,))
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_object_{description.key}"
+
+    @callback
+    def _update_from_data(self, data: SwegonCasaSnapshot) -> None:
+        """Update the sensor value from a device snapshot."""
+        if (value := data.get(self.entity_description.key)) is None:
+            return
+
+        if options := self.entity_description.options:
+            # Multi-state values count their states from 1.
+            index = int(value) - 1
+            value = options[index] if 0 <= index < len(options) else None
+
+        self._attr_native_value = value
@@ -0,0 +1,109 @@
+"""Snapshot of the values read from a Swegon Casa unit."""
+
+import time
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+
+class SwegonCasaSnapshot(Mapping[str, Any]):
+    """Immutable values of the objects of a unit at one point in time.
+
+    Values are typed as the object registry describes them. `timestamp` is the
+    monotonic time the values were read, and `changed` holds the object IDs
+    that differ from the snapshot before, or None when nothing was compared.
+    Derived snapshots share the values of their source until they differ.
+    """
+
+    __slots__ = ("_changed", "_timestamp", "_values")
+
+    def __init__(
+        self,
+        values: dict[str, Any],
+        timestamp: float | None = None,
+        changed: frozenset[str] | None = None,
+    ) -> None:
+        """Initialize the snapshot, taking ownership of `values`."""
+        self._values = values
+        self._timestamp = time.monotonic() if timestamp is None else timestamp
+        self._changed = changed
+
+    @property
+    def timestamp(self) -> float:
+        """Return the monotonic time the values were read."""
+        return self._timestamp
+
+    @property
+    def changed(self) -> frozenset[str] | None:
+        """Return the object IDs changed since the snapshot before."""
+        return self._changed
+
+    def __getitem__(self, object_id: str) -> Any:
+        """Return the value of an object."""
+        return self._values[object_id]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the object IDs."""
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        """Return the number of objects."""
+        return len(self._values)
+
+    def __contains__(self, object_id: object) -> bool:
+        """Return whether the snapshot has a value for an object."""
+        return object_id in self._values
+
+    def __repr__(self) -> str:
+        """Return the values and the changed objects."""
+        return f"SwegonCasaSnapshot({self._values!r}, changed={self._changed!r})"
+
+    def get(self, object_id: str, default: Any = None) -> Any:
+        """Return the value of an object, `default` if it has none."""
+        return self._values.get(object_id, default)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a copy of the values."""
+        return dict(self._values)
+
+    def diff(self, previous: Mapping[str, Any] | None) -> frozenset[str]:
+        """Return the object IDs whose value differs from `previous`.
+
+        Every object is changed when there is nothing to compare with.
+        """
+        if previous is None:
+            return frozenset(self._values)
+        get = previous.get
+        return frozenset(
+            object_id
+            for object_id, value in self._values.items()
+            if get(object_id) != value
+        )
+
+    def compared_to(self, previous: Mapping[str, Any] | None) -> "SwegonCasaSnapshot":
+        """Return the snapshot with the objects changed since `previous`."""
+        return SwegonCasaSnapshot(
+            self._values,
+            self.timestamp,
+            None if previous is None else self.diff(previous),
+        )
+
+    def replace(
+        self, values: Mapping[str, Any], timestamp: float | None = None
+    ) -> "SwegonCasaSnapshot":
+        """Return a snapshot with some values replaced, marked as changed.
+
+        Only values that actually differ are marked. The snapshot is returned
+        as it is when none does.
+        """
+        changed = frozenset(
+            object_id
+            for object_id, value in values.items()
+            if self._values.get(object_id) != value
+        )
+        if not changed:
+            return self
+        return SwegonCasaSnapshot(
+            {**self._values, **values},
+            self.timestamp if timestamp is None else timestamp,
+            changed,
+        )
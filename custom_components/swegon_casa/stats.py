@@ -0,0 +1,146 @@
+"""Request statistics of a Swegon Casa client."""
+
+import time
+from collections import deque
+from collections.abc import Callable
+from enum import StrEnum
+from typing import Any
+
+LATENCY_WINDOW = 100
+TRACE_LENGTH = 50
+
+
+class RequestKind(StrEnum):
+    """Kind of request sent to the unit."""
+
+    LOGIN = "login"
+    READ = "read"
+    WRITE = "write"
+
+
+class RollingLatency:
+    """Latencies of the most recent requests."""
+
+    __slots__ = ("_samples",)
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        """Initialize the window."""
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    def add(self, latency: float) -> None:
+        """Add a latency in seconds."""
+        self._samples.append(latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return the given percentile of the window, None if it is empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[round(percentile / 100 * (len(ordered) - 1))]
+
+
+class RequestRecord:
+    """Timing of one attempt of a request, without its content."""
+
+    __slots__ = (
+        "_start",
+        "attempt",
+        "bytes_in",
+        "bytes_out",
+        "duration",
+        "kind",
+        "outcome",
+        "path",
+        "started",
+    )
+
+    def __init__(
+        self, kind: RequestKind, path: str, attempt: int, bytes_out: int
+    ) -> None:
+        """Initialize the record when the attempt starts."""
+        self.kind = kind
+        self.path = path
+        self.attempt = attempt
+        self.started = time.time()
+        self.duration: float | None = None
+        self.outcome: int | str | None = None
+        self.bytes_out = bytes_out
+        self.bytes_in = 0
+        self._start = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record as a dict."""
+        return {
+            slot: getattr(self, slot)
+            for slot in self.__slots__
+            if not slot.startswith("_")
+        }
+
+
+class RequestStats:
+    """Counters of one kind of request."""
+
+    __slots__ = ("bytes_in", "bytes_out", "failures", "latency", "requests", "retries")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.latency = RollingLatency()
+
+
+class ClientStats:
+    """Statistics of the requests a client sent, by kind of request."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize the statistics."""
+        self.requests = {kind: RequestStats() for kind in RequestKind}
+        self.trace: deque[RequestRecord] = deque(maxlen=TRACE_LENGTH)
+        self.last_snapshot: float | None = None
+        self._clock = clock
+
+    @property
+    def bytes_out(self) -> int:
+        """Return the bytes sent in request bodies."""
+        return sum(stats.bytes_out for stats in self.requests.values())
+
+    @property
+    def bytes_in(self) -> int:
+        """Return the bytes received in response bodies."""
+        return sum(stats.bytes_in for stats in self.requests.values())
+
+    @property
+    def snapshot_age(self) -> float | None:
+        """Return the seconds since the last good snapshot, if there was one."""
+        if self.last_snapshot is None:
+            return None
+        return self._clock() - self.last_snapshot
+
+    def start_attempt(
+        self, kind: RequestKind, path: str, attempt: int, bytes_out: int
+    ) -> RequestRecord:
+        """Record that an attempt of a request is sent."""
+        record = RequestRecord(kind, path, attempt, bytes_out)
+        self.trace.append(record)
+        self.requests[kind].bytes_out += bytes_out
+        return record
+
+    def finish_attempt(
+        self, record: RequestRecord, outcome: int | str, bytes_in: int = 0
+    ) -> None:
+        """Record the HTTP status or error an attempt ended with."""
+        record.duration = time.monotonic() - record._start
+        record.outcome = outcome
+        record.bytes_in = bytes_in
+        self.requests[record.kind].bytes_in += bytes_in
+
+    def record_snapshot(self) -> None:
+        """Record that a good snapshot was read."""
+        self.last_snapshot = self._clock()
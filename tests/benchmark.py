@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark the Swegon Casa client against the local simulator.
+
+Measures polls per second, p50/p99 latency and memory allocated per poll. The
+simulator runs in the same process, so allocation figures include its share:
+
+    python tests/benchmark.py --polls 500 --latency 0.005 --jitter 0.002
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simulator import SwegonCasaSimulator
+
+from custom_components.swegon_casa.client import SwegonCasaClient
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    """Return the given percentile of the samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _measure_polls(client: SwegonCasaClient, polls: int) -> list[float]:
+    """Run sequential polls and return their latencies in seconds."""
+    latencies = []
+    for _ in range(polls):
+        start = time.perf_counter()
+        if await client.fetch_data() is None:
+            raise RuntimeError("Poll failed")
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def _measure_allocations(
+    client: SwegonCasaClient, polls: int
+) -> tuple[float, float]:
+    """Return the peak bytes allocated and the blocks retained per poll."""
+    peaks = []
+    tracemalloc.start()
+    blocks_before = len(tracemalloc.take_snapshot().traces)
+    for _ in range(polls):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await client.fetch_data()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - current)
+    blocks_after = len(tracemalloc.take_snapshot().traces)
+    tracemalloc.stop()
+
+    return statistics.fmean(peaks), (blocks_after - blocks_before) / polls
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the benchmark and print the results."""
+    simulator = SwegonCasaSimulator(
+        latency=args.latency, jitter=args.jitter, drop_rate=args.drop_rate, seed=1
+    )
+    await simulator.start()
+
+    client = SwegonCasaClient(simulator.host, simulator.username, simulator.password)
+    client.create_session()
+
+    try:
+        await _measure_polls(client, args.warmup)
+
+        started = time.perf_counter()
+        latencies = await _measure_polls(client, args.polls)
+        elapsed = time.perf_counter() - started
+
+        peak_bytes, retained_blocks = await _measure_allocations(
+            client, args.allocation_polls
+        )
+    finally:
+        await client.close()
+        await simulator.stop()
+
+    requests = simulator.requests.total()
+    print(f"polls:              {args.polls}")
+    print(f"requests to device: {requests}")
+    print(f"polls/s:            {args.polls / elapsed:.1f}")
+    print(f"latency p50:        {_percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"latency p99:        {_percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"latency mean:       {statistics.fmean(latencies) * 1000:.2f} ms")
+    print(f"peak alloc/poll:    {peak_bytes / 1024:.1f} KiB")
+    print(f"retained/poll:      {retained_blocks:.1f} blocks")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--allocation-polls", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
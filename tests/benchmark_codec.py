@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark encoding Swegon Casa requests.
+
+Compares building and serializing the request dicts on every call with the
+cached read request and the write template used by the client, and decoding a
+read response with the standard library and several lookups per object with
+the single-pass decoder:
+
+    python tests/benchmark_codec.py --calls 10000
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.swegon_casa.client import DEFAULT_READ_IDS, SwegonCasaClient
+from custom_components.swegon_casa.codec import (
+    decode_response,
+    encode_write_request,
+    extract_values,
+)
+
+WRITE_VALUES = {"111": 4, "154": 1}
+
+
+def _dict_read(read_ids: list[str]) -> bytes:
+    """Encode a read request the way the client used to."""
+    objects = [{"id": id, "properties": {"85": {}}, "device": 255} for id in read_ids]
+    return json.dumps(
+        {"jsonrpc": "2.0", "id": 0, "params": {"objects": objects}, "method": "read"}
+    ).encode()
+
+
+def _dict_write(values: dict[str, int]) -> bytes:
+    """Encode a write request the way the client used to."""
+    objects = [
+        {"id": write_id, "properties": {"85": {"value": int(value)}}, "device": 255}
+        for write_id, value in values.items()
+    ]
+    return json.dumps(
+        {"jsonrpc": "2.0", "id": 0, "params": {"objects": objects}, "method": "write"}
+    ).encode()
+
+
+def _read_response(read_ids: list[str]) -> bytes:
+    """Return a read response for the objects."""
+    objects = [
+        {"id": id, "device": 255, "properties": {"85": {"value": 20.5}}}
+        for id in read_ids
+    ]
+    return json.dumps(
+        {"jsonrpc": "2.0", "id": 0, "result": {"objects": objects}}
+    ).encode()
+
+
+def _stdlib_values(body: bytes) -> dict[str, Any]:
+    """Decode a read response the way the client used to."""
+    json_res = json.loads(body.decode())
+    sorted_data = {}
+    for item in json_res.get("result", {}).get("objects", []):
+        item_id = item.get("id")
+        measurement = item.get("properties", {}).get("85")
+        if measurement:
+            value = measurement.get("value")
+            if value is not None:
+                sorted_data[item_id] = value
+    return sorted_data
+
+
+def _measure(encode: Callable[[], Any], calls: int) -> tuple[float, float]:
+    """Return the microseconds and peak bytes allocated per call."""
+    encode()
+    start = time.perf_counter()
+    for _ in range(calls):
+        encode()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    peaks = 0
+    for _ in range(min(calls, 1000)):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        encode()
+        peaks += max(0, tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    return elapsed / calls * 1e6, peaks / min(calls, 1000)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=10000)
+    args = parser.parse_args()
+
+    read_ids = sorted(DEFAULT_READ_IDS, key=int)
+    client = SwegonCasaClient("host", "user", "pass")
+    body = _read_response(read_ids)
+    cases = {
+        "read, dicts + json.dumps": lambda: _dict_read(read_ids),
+        "read, cached request": lambda: client._get_read_request(DEFAULT_READ_IDS),
+        "write, dicts + json.dumps": lambda: _dict_write(WRITE_VALUES),
+        "write, template": lambda: encode_write_request(WRITE_VALUES),
+        "decode, json + lookups": lambda: _stdlib_values(body),
+        "decode, single pass": lambda: extract_values(decode_response(body)),
+    }
+    for name, encode in cases.items():
+        micros, peak = _measure(encode, args.calls)
+        print(f"{name:28} {micros:7.2f} us/call {peak / 1024:7.2f} KiB/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Fixtures running the Swegon Casa client against the local simulator."""
+
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import aiohttp
+import pytest
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simulator import SwegonCasaSimulator
+
+from custom_components.swegon_casa.client import SwegonCasaClient
+from custom_components.swegon_casa.resilience import RetryPolicy
+
+
+@pytest.fixture
+def retry_policy() -> RetryPolicy:
+    """Return a retry policy that retries without slowing the tests down."""
+    return RetryPolicy(base_delay=0.01, max_delay=0.05)
+
+
+@pytest.fixture
+async def hass(tmp_path: Path) -> AsyncIterator[HomeAssistant]:
+    """Return a Home Assistant instance keeping its storage in a temp dir."""
+    hass = HomeAssistant(str(tmp_path))
+    yield hass
+    await hass.async_stop(force=True)
+
+
+@pytest.fixture
+async def simulator() -> AsyncIterator[SwegonCasaSimulator]:
+    """Run a simulated Smart Access module."""
+    sim = SwegonCasaSimulator()
+    await sim.start()
+    yield sim
+    await sim.stop()
+
+
+@pytest.fixture
+async def client(
+    simulator: SwegonCasaSimulator, retry_policy: RetryPolicy
+) -> AsyncIterator[SwegonCasaClient]:
+    """Return a client connected to the simulator."""
+    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False))
+    client = SwegonCasaClient(
+        simulator.host,
+        simulator.username,
+        simulator.password,
+        write_coalesce_window=0,
+        retry_policy=retry_policy,
+    )
+    client.set_session(session)
+    yield client
+    await session.close()
@@ -0,0 +1,307 @@
+"""Local simulator of a Swegon Casa Smart Access module.
+
+Serves the same HTTPS endpoints as the device: `/handle_login` and the JSON-RPC
+`/api` endpoint reading and writing property 85 of the objects in
+`SwegonObjectId`, and reading some of their metadata and the firmware revision
+of the device object. Latency, jitter and connection drops are configurable so the
+client can be tested and benchmarked without a real unit.
+"""
+
+import asyncio
+import datetime
+import json
+import random
+import secrets
+import ssl
+import sys
+import tempfile
+import weakref
+from collections import Counter
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs
+
+from aiohttp import web
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.swegon_casa.lib import SwegonObjectId
+
+SESSION_COOKIE = "session"
+DEVICE_OBJECT_ID = "0"
+
+DEFAULT_VALUES: dict[str, Any] = {
+    SwegonObjectId.TEMPERATURE_SUPPLY: 19.5,
+    SwegonObjectId.TEMPERATURE_ROOM: 21.2,
+    SwegonObjectId.TEMPERATURE_OUTSIDE: 4.8,
+    SwegonObjectId.HUMIDITY_PERCENTAGE: 38,
+    SwegonObjectId.HUMIDITY_ABSOLUTE: 7.1,
+    SwegonObjectId.CURRENT_FAN_SPEED: 1650,
+    SwegonObjectId.VENTILATION_LEVEL_IN: 55,
+    SwegonObjectId.VENTILATION_LEVEL_OUT: 52,
+    SwegonObjectId.BOOST_COUNTDOWN: 0,
+    SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE: 20,
+    SwegonObjectId.CLIMATE_MODE: 2,
+    SwegonObjectId.TRAVEL_MODE_TEMPERATURE_DROP: 3,
+    SwegonObjectId.AUTO_HUMIDITY_CONTROL_MODE: 3,
+    SwegonObjectId.SUMMER_NIGHT_COOLING_MODE: 0,
+    SwegonObjectId.FIREPLACE_MODE: 0,
+    SwegonObjectId.TRAVEL_MODE: 0,
+}
+
+
+FIRMWARE_REVISION = "2.4.1"
+
+# Metadata properties of some objects, numbered as in BACnet.
+DEFAULT_METADATA: dict[str, dict[str, Any]] = {
+    SwegonObjectId.TEMPERATURE_SUPPLY: {"77": "Supply air temperature", "117": 62},
+    SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE: {
+        "77": "Supply air setpoint",
+        "117": 62,
+        "69": 13,
+        "65": 25,
+    },
+    SwegonObjectId.CLIMATE_MODE: {
+        "77": "Operating mode",
+        "110": ["Away", "Home", "Boost", "Travel", "Off", "Fireplace"],
+    },
+}
+
+
+def _create_ssl_context(directory: Path) -> ssl.SSLContext:
+    """Create a server SSL context with a throwaway self-signed certificate."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "swegon-casa-sim")])
+    now = datetime.datetime.now(datetime.UTC)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = directory / "cert.pem"
+    key_path = directory / "key.pem"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+class SwegonCasaSimulator:
+    """Simulated Swegon Casa Smart Access module."""
+
+    def __init__(
+        self,
+        username: str = "service",
+        password: str = "secret",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        max_objects: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the simulator."""
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.max_objects = max_objects
+        self.values: dict[str, Any] = {str(k): v for k, v in DEFAULT_VALUES.items()}
+        self.metadata: dict[str, dict[str, Any]] = {
+            str(k): dict(v) for k, v in DEFAULT_METADATA.items()
+        }
+        self.firmware = FIRMWARE_REVISION
+        # Objects whose writes the unit rejects, or acknowledges but ignores.
+        self.rejected_writes: set[str] = set()
+        self.ignored_writes: set[str] = set()
+        self.requests: Counter[str] = Counter()
+        self.dropped = 0
+        self.connections = 0
+
+        self._random = random.Random(seed)
+        self._sessions: set[str] = set()
+        self._transports: weakref.WeakSet[asyncio.BaseTransport] = weakref.WeakSet()
+        self._runner: web.AppRunner | None = None
+        self._tempdir: tempfile.TemporaryDirectory[str] | None = None
+        self.port = 0
+
+    @property
+    def host(self) -> str:
+        """Return the host the client should connect to."""
+        return f"127.0.0.1:{self.port}"
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        self._tempdir = tempfile.TemporaryDirectory()
+        ssl_context = _create_ssl_context(Path(self._tempdir.name))
+
+        app = web.Application()
+        app.router.add_post("/handle_login", self._handle_login)
+        app.router.add_post("/api", self._handle_api)
+
+        app.on_response_prepare.append(self._count_connection)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0, ssl_context=ssl_context)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._tempdir:
+            self._tempdir.cleanup()
+            self._tempdir = None
+
+    async def _count_connection(
+        self, request: web.Request, response: web.StreamResponse
+    ) -> None:
+        """Count the connections requests arrive on."""
+        transport = request.transport
+        if transport is not None and transport not in self._transports:
+            self._transports.add(transport)
+            self.connections += 1
+
+    def expire_sessions(self) -> None:
+        """Invalidate every session, as the device does after a timeout."""
+        self._sessions.clear()
+
+    async def _simulate_network(self, request: web.Request) -> bool:
+        """Apply latency and jitter; return False when the connection drops."""
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.drop_rate and self._random.random() < self.drop_rate:
+            self.dropped += 1
+            if request.transport:
+                request.transport.close()
+            return False
+
+        return True
+
+    async def _handle_login(self, request: web.Request) -> web.StreamResponse:
+        """Handle a login form post."""
+        self.requests["login"] += 1
+        if not await self._simulate_network(request):
+            return web.Response()
+
+        # The client posts the form as a plain string, without a content type.
+        form = parse_qs(await request.text())
+        if form.get("username") != [self.username] or form.get("password") != [
+            self.password
+        ]:
+            return web.Response(status=401, text="Invalid credentials")
+
+        token = secrets.token_hex(8)
+        self._sessions.add(token)
+        response = web.Response(text="OK")
+        response.set_cookie(SESSION_COOKIE, token)
+        return response
+
+    async def _handle_api(self, request: web.Request) -> web.StreamResponse:
+        """Handle a JSON-RPC read or write request."""
+        body = await request.read()
+        payload = json.loads(body)
+        method = payload.get("method")
+        self.requests[method] += 1
+
+        if not await self._simulate_network(request):
+            return web.Response()
+
+        if request.cookies.get(SESSION_COOKIE) not in self._sessions:
+            return web.Response(status=401, text="Unauthorized")
+
+        if self.max_objects and len(payload["params"]["objects"]) > self.max_objects:
+            return web.json_response(
+                {
+                    "jsonrpc": "2.0",
+                    "id": payload.get("id"),
+                    "error": {"code": -32600, "message": "Too many objects"},
+                }
+            )
+
+        if method == "read":
+            objects = [self._read_object(item) for item in payload["params"]["objects"]]
+        elif method == "write":
+            objects = [
+                self._write_object(item) for item in payload["params"]["objects"]
+            ]
+        else:
+            return web.json_response(
+                {
+                    "jsonrpc": "2.0",
+                    "id": payload.get("id"),
+                    "error": {"code": -32601, "message": "Method not found"},
+                }
+            )
+
+        return web.json_response(
+            {
+                "jsonrpc": "2.0",
+                "id": payload.get("id"),
+                "result": {"objects": objects},
+            }
+        )
+
+    def _read_object(self, item: dict[str, Any]) -> dict[str, Any]:
+        """Read the requested properties of one object."""
+        object_id = item["id"]
+        if object_id == DEVICE_OBJECT_ID:
+            properties = {"44": self.firmware}
+        elif object_id in self.values:
+            properties = {"85": self.values[object_id]}
+            properties.update(self.metadata.get(object_id, {}))
+        else:
+            return {"id": object_id, "device": 255, "error": "Unknown object"}
+
+        return {
+            "id": object_id,
+            "device": 255,
+            "properties": {
+                prop: (
+                    {"value": properties[prop]}
+                    if prop in properties
+                    else {"error": "Unknown property"}
+                )
+                for prop in item["properties"]
+            },
+        }
+
+    def _write_object(self, item: dict[str, Any]) -> dict[str, Any]:
+        """Write property 85 of one object."""
+        object_id = item["id"]
+        if object_id not in self.values:
+            return {"id": object_id, "device": 255, "error": "Unknown object"}
+        if object_id in self.rejected_writes:
+            return {"id": object_id, "device": 255, "error": "Write access denied"}
+
+        value = item["properties"]["85"]["value"]
+        if object_id not in self.ignored_writes:
+            self.values[object_id] = value
+        return {
+            "id": object_id,
+            "device": 255,
+            "properties": {"85": {"value": value}},
+        }
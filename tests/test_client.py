@@ -0,0 +1,386 @@
+"""Tests for the Swegon Casa client against the local simulator."""
+
+import asyncio
+import logging
+from typing import Any
+
+import aiohttp
+import pytest
+from simulator import SwegonCasaSimulator
+
+from custom_components.swegon_casa.client import (
+    FORCE_CLOSE_AFTER_DISCONNECTS,
+    SwegonCasaClient,
+)
+from custom_components.swegon_casa.lib import (
+    FIRMWARE_OBJECT_ID,
+    SwegonObjectId,
+    SwegonProperty,
+)
+from custom_components.swegon_casa.resilience import (
+    CircuitBreaker,
+    CircuitState,
+    RetryPolicy,
+)
+from custom_components.swegon_casa.stats import RequestKind
+
+
+async def test_fetch_data(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a poll returns property 85 of every object."""
+    data = await client.fetch_data()
+
+    assert data is not None
+    assert data[SwegonObjectId.TEMPERATURE_SUPPLY] == 19.5
+    assert data[SwegonObjectId.CLIMATE_MODE] == 2
+    assert len(data) == len(SwegonObjectId)
+
+
+async def test_fetch_data_read_ids(client: SwegonCasaClient) -> None:
+    """Test a poll reads only the requested objects."""
+    read_ids = {SwegonObjectId.TEMPERATURE_ROOM, SwegonObjectId.CLIMATE_MODE}
+
+    data = await client.fetch_data(read_ids)
+    request = client._get_read_request(read_ids)
+    assert data == {
+        SwegonObjectId.TEMPERATURE_ROOM: 21.2,
+        SwegonObjectId.CLIMATE_MODE: 2,
+    }
+
+    assert await client.fetch_data(list(read_ids)) is not None
+    assert client._get_read_request(list(read_ids)) is request
+
+    data = await client.fetch_data()
+    assert data is not None
+    assert len(data) == len(SwegonObjectId)
+
+
+async def test_written_values_read_back(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a write reads back the written object and its dependents."""
+    read_back: list[dict[str, Any]] = []
+    client.on_read_back(read_back.append)
+    simulator.values[SwegonObjectId.BOOST_COUNTDOWN] = 0
+
+    assert (await client.set_values({SwegonObjectId.CLIMATE_MODE: 3}))[
+        SwegonObjectId.CLIMATE_MODE
+    ]
+
+    assert simulator.requests["read"] == 1
+    assert read_back == [
+        {
+            SwegonObjectId.CLIMATE_MODE: 3,
+            SwegonObjectId.BOOST_COUNTDOWN: 0,
+            SwegonObjectId.TRAVEL_MODE: 0,
+            SwegonObjectId.FIREPLACE_MODE: 0,
+        }
+    ]
+
+
+async def test_read_properties(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test metadata and the firmware revision are read in one request."""
+    properties = await client.read_properties(
+        [FIRMWARE_OBJECT_ID, SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE],
+        [SwegonProperty.FIRMWARE_REVISION, SwegonProperty.MIN_VALUE],
+    )
+
+    assert properties == {
+        FIRMWARE_OBJECT_ID: {SwegonProperty.FIRMWARE_REVISION: simulator.firmware},
+        SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE: {SwegonProperty.MIN_VALUE: 13},
+    }
+    assert simulator.requests["read"] == 1
+
+
+async def test_session_reused_between_polls(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test the client logs in once and reuses the session."""
+    for _ in range(3):
+        assert await client.fetch_data() is not None
+
+    assert simulator.requests["login"] == 1
+    assert simulator.requests["read"] == 3
+
+
+async def test_expired_session_logs_in_again(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a rejected session is renewed once and the request replayed."""
+    assert await client.fetch_data() is not None
+    simulator.expire_sessions()
+
+    assert await client.fetch_data() is not None
+    assert simulator.requests["login"] == 2
+    assert simulator.requests["read"] == 3
+
+
+async def test_concurrent_callers_share_relogin(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test concurrent requests on an expired session share one login."""
+    assert await client.fetch_data() is not None
+    simulator.expire_sessions()
+
+    results = await asyncio.gather(*(client.fetch_data() for _ in range(5)))
+
+    assert all(result is not None for result in results)
+    assert simulator.requests["login"] == 2
+
+
+async def test_invalid_credentials(simulator: SwegonCasaSimulator) -> None:
+    """Test a poll fails cleanly when the login is refused."""
+    client = SwegonCasaClient(simulator.host, simulator.username, "wrong")
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(ssl=False)
+    ) as session:
+        client.set_session(session)
+        assert not await client.login()
+        assert await client.fetch_data() is None
+
+
+async def test_set_values_single_request(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test several objects are written in one request."""
+    results = await client.set_values(
+        {
+            SwegonObjectId.CLIMATE_MODE: 4,
+            SwegonObjectId.TRAVEL_MODE: 1,
+        }
+    )
+
+    assert results == {
+        SwegonObjectId.CLIMATE_MODE: True,
+        SwegonObjectId.TRAVEL_MODE: True,
+    }
+    assert simulator.requests["write"] == 1
+    assert simulator.values[SwegonObjectId.CLIMATE_MODE] == 4
+    assert simulator.values[SwegonObjectId.TRAVEL_MODE] == 1
+
+
+async def test_set_values_partial_failure(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a rejected object is reported without failing the others."""
+    results = await client.set_values({SwegonObjectId.FIREPLACE_MODE: 1, "9999": 1})
+
+    assert results == {SwegonObjectId.FIREPLACE_MODE: True, "9999": False}
+    assert simulator.values[SwegonObjectId.FIREPLACE_MODE] == 1
+
+
+async def test_set_value_coalesces_writes(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test rapid writes to one object collapse into a write of the last value."""
+    client.write_coalesce_window = 0.05
+    setpoint = SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE
+
+    results = await asyncio.gather(
+        *(client.set_value(setpoint, value) for value in (21, 22, 23))
+    )
+
+    assert results == [True, True, True]
+    assert simulator.requests["write"] == 1
+    assert simulator.values[setpoint] == 23
+
+
+async def test_set_value_survives_cancelled_first_caller(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test cancelling the caller that started a burst still writes the last value."""
+    client.write_coalesce_window = 0.05
+    setpoint = SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE
+
+    first = asyncio.create_task(client.set_value(setpoint, 21))
+    await asyncio.sleep(0)
+    last = asyncio.create_task(client.set_value(setpoint, 22))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await last
+    assert first.cancelled()
+    assert simulator.requests["write"] == 1
+    assert simulator.values[setpoint] == 22
+
+
+async def test_dropped_connection_is_retried(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a request survives a single dropped connection."""
+    assert await client.login()
+    simulator.drop_rate = 1.0
+    task = asyncio.create_task(client.fetch_data())
+    while not simulator.dropped:
+        await asyncio.sleep(0.01)
+    simulator.drop_rate = 0.0
+
+    assert await task is not None
+
+
+async def test_own_session_keeps_connections_alive(
+    simulator: SwegonCasaSimulator,
+) -> None:
+    """Test a client session reuses its connection between polls."""
+    client = SwegonCasaClient(simulator.host, simulator.username, simulator.password)
+    session = client.create_session()
+    try:
+        for _ in range(3):
+            assert await client.fetch_data() is not None
+
+        assert simulator.connections == 1
+        assert not session.connector.force_close
+    finally:
+        await client.close()
+
+    assert client.session is None
+
+
+async def test_own_session_falls_back_to_force_close(
+    simulator: SwegonCasaSimulator, retry_policy: RetryPolicy
+) -> None:
+    """Test keep-alive is turned off when the device keeps dropping connections."""
+    client = SwegonCasaClient(
+        simulator.host,
+        simulator.username,
+        simulator.password,
+        retry_policy=retry_policy,
+    )
+    client.create_session()
+    try:
+        assert await client.login()
+        simulator.drop_rate = 1.0
+        assert await client.fetch_data() is None
+        simulator.drop_rate = 0.0
+
+        assert client.force_close
+        assert client.session.connector.force_close
+        assert await client.fetch_data() is not None
+    finally:
+        await client.close()
+
+
+async def test_replaced_session_closed_after_requests_in_flight(
+    simulator: SwegonCasaSimulator,
+) -> None:
+    """Test a session replaced for keep-alive is closed once its requests finish."""
+    client = SwegonCasaClient(simulator.host, simulator.username, simulator.password)
+    old_session = client.create_session()
+    try:
+        assert await client.login()
+        simulator.latency = 0.05
+        poll = asyncio.create_task(client.fetch_data())
+        await asyncio.sleep(0.01)
+
+        client._disconnects = FORCE_CLOSE_AFTER_DISCONNECTS - 1
+        await client._handle_disconnect()
+
+        assert client.session is not old_session
+        assert not old_session.closed
+        assert await poll is not None
+        assert old_session.closed
+    finally:
+        await client.close()
+
+
+async def test_retry_past_deadline_not_sent(
+    client: SwegonCasaClient,
+    simulator: SwegonCasaSimulator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test no retry starts past the deadline and only sent attempts are logged."""
+    client.retry_policy = RetryPolicy(base_delay=1.0, jitter=0, deadline=0.5)
+    assert await client.login()
+    simulator.drop_rate = 1.0
+
+    with caplog.at_level(logging.ERROR):
+        assert await client.fetch_data() is None
+
+    assert simulator.dropped == 1
+    assert "failed after 1 attempt(s)" in caplog.text
+
+
+async def test_open_circuit_skips_unreachable_unit(
+    simulator: SwegonCasaSimulator, retry_policy: RetryPolicy
+) -> None:
+    """Test an unreachable unit is left alone until the circuit lets a probe in."""
+    now = 0.0
+    breaker = CircuitBreaker(failure_threshold=2, clock=lambda: now)
+    client = SwegonCasaClient(
+        simulator.host,
+        simulator.username,
+        simulator.password,
+        retry_policy=retry_policy,
+        circuit_breaker=breaker,
+    )
+    client.create_session()
+    try:
+        assert await client.login()
+        simulator.drop_rate = 1.0
+        for _ in range(2):
+            assert await client.fetch_data() is None
+        assert breaker.state is CircuitState.OPEN
+        assert simulator.dropped == 2 * retry_policy.attempts
+
+        assert await client.fetch_data() is None
+        assert simulator.dropped == 2 * retry_policy.attempts
+
+        simulator.drop_rate = 0.0
+        now = breaker.reset_timeout
+        assert await client.fetch_data() is not None
+        assert breaker.state is CircuitState.CLOSED
+    finally:
+        await client.close()
+
+
+async def test_request_stats(
+    client: SwegonCasaClient,
+    simulator: SwegonCasaSimulator,
+    retry_policy: RetryPolicy,
+) -> None:
+    """Test requests, retries, failures and bytes are counted and traced."""
+    assert client.stats.snapshot_age is None
+    assert await client.fetch_data() is not None
+
+    simulator.drop_rate = 1.0
+    assert await client.fetch_data() is None
+    simulator.drop_rate = 0.0
+
+    read = client.stats.requests[RequestKind.READ]
+    assert read.requests == 2
+    assert read.retries == retry_policy.attempts - 1
+    assert read.failures == 1
+    assert len(read.latency) == 2
+    assert read.bytes_out == len(client._get_read_request(None)) * (
+        1 + retry_policy.attempts
+    )
+    assert client.stats.requests[RequestKind.LOGIN].requests == 1
+    assert client.stats.bytes_in > 0
+    assert client.stats.snapshot_age is not None
+
+    outcomes = [(record.kind, record.outcome) for record in client.stats.trace]
+    assert outcomes == [
+        (RequestKind.LOGIN, 200),
+        (RequestKind.READ, 200),
+        *[(RequestKind.READ, "ServerDisconnectedError")] * retry_policy.attempts,
+    ]
+
+
+async def test_close_cancels_coalesced_writes(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a write still waiting for its coalescing window is not sent after close."""
+    client.write_coalesce_window = 0.05
+    write = asyncio.create_task(
+        client.set_value(SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE, 22)
+    )
+    await asyncio.sleep(0)
+
+    await client.close()
+    await asyncio.sleep(0.1)
+
+    assert write.cancelled()
+    assert simulator.requests["write"] == 0
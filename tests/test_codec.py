@@ -0,0 +1,105 @@
+"""Tests for the Swegon Casa request encoding."""
+
+import json
+
+from custom_components.swegon_casa.codec import (
+    decode_response,
+    encode_properties_request,
+    encode_read_request,
+    encode_write_request,
+    extract_error,
+    extract_properties,
+    extract_values,
+)
+from custom_components.swegon_casa.lib import SwegonObjectId
+
+
+def test_encode_read_request() -> None:
+    """Test a read request lists the objects in numeric ID order."""
+    request = json.loads(encode_read_request({SwegonObjectId.CLIMATE_MODE, "17", "9"}))
+
+    assert request == {
+        "jsonrpc": "2.0",
+        "id": 0,
+        "params": {
+            "objects": [
+                {"id": object_id, "properties": {"85": {}}, "device": 255}
+                for object_id in ("9", "17", "111")
+            ]
+        },
+        "method": "read",
+    }
+
+
+def test_encode_write_request() -> None:
+    """Test a write request carries every value as an integer."""
+    request = json.loads(
+        encode_write_request({SwegonObjectId.CLIMATE_MODE: 4, "154": 1.0})
+    )
+
+    assert request["method"] == "write"
+    assert request["params"]["objects"] == [
+        {"id": "111", "properties": {"85": {"value": 4}}, "device": 255},
+        {"id": "154", "properties": {"85": {"value": 1}}, "device": 255},
+    ]
+
+
+def test_extract_values() -> None:
+    """Test values are mapped by object ID, skipping objects without one."""
+    response = decode_response(
+        b'{"jsonrpc":"2.0","id":0,"result":{"objects":['
+        b'{"id":"17","device":255,"properties":{"85":{"value":19.5}}},'
+        b'{"id":"111","device":255,"properties":{"85":{"value":2}}},'
+        b'{"id":"999","device":255,"error":"Unknown object"},'
+        b'{"id":"154","device":255,"properties":{"85":{"value":null}}}]}}'
+    )
+
+    assert extract_values(response) == {"17": 19.5, "111": 2}
+
+
+def test_extract_values_typed() -> None:
+    """Test known objects get their data type and unknown ones are kept as sent."""
+    response = decode_response(
+        b'{"jsonrpc":"2.0","id":0,"result":{"objects":['
+        b'{"id":"18","device":255,"properties":{"85":{"value":21}}},'
+        b'{"id":"111","device":255,"properties":{"85":{"value":3.0}}},'
+        b'{"id":"200","device":255,"properties":{"85":{"value":"bad"}}},'
+        b'{"id":"512","device":255,"properties":{"85":{"value":"text"}}}]}}'
+    )
+
+    values = extract_values(response)
+
+    assert values == {"18": 21.0, "111": 3, "512": "text"}
+    assert type(values["18"]) is float
+    assert type(values["111"]) is int
+
+
+def test_decode_unexpected_response() -> None:
+    """Test bodies that are not JSON or carry no objects are rejected."""
+    assert decode_response(b"<html>Login</html>") is None
+    assert extract_values(None) is None
+    assert extract_values(decode_response(b'{"error":{"code":-32601}}')) is None
+    assert extract_error(decode_response(b'{"error":{"code":-32601}}')) == {
+        "code": -32601
+    }
+    assert extract_error(None) is None
+
+
+def test_properties_round_trip() -> None:
+    """Test several properties are requested and returned per object."""
+    request = json.loads(encode_properties_request(["163", "0"], ["77", "69"]))
+    assert request["params"]["objects"] == [
+        {"id": "163", "properties": {"77": {}, "69": {}}, "device": 255},
+        {"id": "0", "properties": {"77": {}, "69": {}}, "device": 255},
+    ]
+
+    response = decode_response(
+        b'{"result":{"objects":['
+        b'{"id":"163","properties":{"77":{"value":"Setpoint"},"69":{"value":13}}},'
+        b'{"id":"0","properties":{"77":{"error":"Unknown property"}}},'
+        b'{"id":"999","error":"Unknown object"}]}}'
+    )
+    assert extract_properties(response) == {
+        "163": {"77": "Setpoint", "69": 13},
+        "0": {},
+    }
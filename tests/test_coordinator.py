@@ -0,0 +1,253 @@
+"""Tests for the Swegon Casa coordinator against the local simulator."""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+import pytest
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from simulator import SwegonCasaSimulator
+
+from custom_components.swegon_casa.client import SwegonCasaClient
+from custom_components.swegon_casa.const import DOMAIN
+from custom_components.swegon_casa.coordinator import (
+    STORAGE_VERSION,
+    SwegonCasaDataUpdateCoordinator,
+)
+from custom_components.swegon_casa.fleet import SwegonCasaFleet
+from custom_components.swegon_casa.lib import SwegonObjectId
+from custom_components.swegon_casa.scheduler import AdaptivePollInterval
+
+
+def _create_coordinator(
+    hass: HomeAssistant, entry: ConfigEntry, client: SwegonCasaClient
+) -> SwegonCasaDataUpdateCoordinator:
+    """Return a coordinator polling the client as the only unit of a fleet."""
+    fleet = SwegonCasaFleet(stagger=0)
+    fleet.add_unit(entry.entry_id, client)
+    return SwegonCasaDataUpdateCoordinator(hass, entry, client, fleet)
+
+
+@pytest.fixture
+def entry() -> ConfigEntry:
+    """Return a config entry of the simulated unit."""
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Swegon Casa",
+        data={},
+        source=SOURCE_USER,
+        options={},
+    )
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant, entry: ConfigEntry, client: SwegonCasaClient
+) -> AsyncIterator[SwegonCasaDataUpdateCoordinator]:
+    """Return a coordinator that polled the simulator once."""
+    coordinator = _create_coordinator(hass, entry, client)
+    await coordinator.async_refresh()
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+async def test_write_shown_and_confirmed_by_read_back(
+    coordinator: SwegonCasaDataUpdateCoordinator, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a written value is shown at once and kept once read back."""
+    shown = []
+    coordinator.async_add_listener(
+        lambda: shown.append(coordinator.data[SwegonObjectId.FIREPLACE_MODE]),
+        frozenset({SwegonObjectId.FIREPLACE_MODE}),
+    )
+    reads = simulator.requests["read"]
+
+    assert await coordinator.async_write({SwegonObjectId.FIREPLACE_MODE: 1})
+
+    assert shown == [1]
+    assert simulator.requests["read"] == reads + 1
+    assert coordinator.data[SwegonObjectId.FIREPLACE_MODE] == 1
+
+
+async def test_write_kept_by_unit_shown_after_read_back(
+    coordinator: SwegonCasaDataUpdateCoordinator, simulator: SwegonCasaSimulator
+) -> None:
+    """Test the read-back shows the value the unit kept instead of the written one."""
+    simulator.ignored_writes.add(SwegonObjectId.CLIMATE_MODE)
+
+    assert await coordinator.async_write({SwegonObjectId.CLIMATE_MODE: 4})
+
+    assert coordinator.data[SwegonObjectId.CLIMATE_MODE] == 2
+
+
+async def test_rejected_write_rolled_back(
+    coordinator: SwegonCasaDataUpdateCoordinator, simulator: SwegonCasaSimulator
+) -> None:
+    """Test only the values the unit rejected are rolled back."""
+    simulator.rejected_writes.add(SwegonObjectId.TRAVEL_MODE)
+
+    written = await coordinator.async_write(
+        {SwegonObjectId.CLIMATE_MODE: 3, SwegonObjectId.TRAVEL_MODE: 1}
+    )
+
+    assert not written
+    assert coordinator.data[SwegonObjectId.CLIMATE_MODE] == 3
+    assert coordinator.data[SwegonObjectId.TRAVEL_MODE] == 0
+
+
+async def test_failed_write_rolled_back(
+    coordinator: SwegonCasaDataUpdateCoordinator, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a write that never reached the unit is rolled back."""
+    simulator.drop_rate = 1.0
+
+    assert not await coordinator.async_write({SwegonObjectId.FIREPLACE_MODE: 1})
+
+    assert coordinator.data[SwegonObjectId.FIREPLACE_MODE] == 0
+
+
+async def test_pending_value_survives_earlier_read(
+    coordinator: SwegonCasaDataUpdateCoordinator, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a poll sent before the write was acknowledged keeps the written value."""
+    simulator.latency = 0.05
+    poll = asyncio.create_task(coordinator.async_refresh())
+    await asyncio.sleep(0.01)
+    write = asyncio.create_task(
+        coordinator.async_write({SwegonObjectId.FIREPLACE_MODE: 1})
+    )
+
+    await poll
+    assert coordinator.data[SwegonObjectId.FIREPLACE_MODE] == 1
+
+    assert await write
+    assert coordinator.data[SwegonObjectId.FIREPLACE_MODE] == 1
+
+
+async def test_write_read_only_object(
+    coordinator: SwegonCasaDataUpdateCoordinator, simulator: SwegonCasaSimulator
+) -> None:
+    """Test writing an object the unit only reports is refused."""
+    with pytest.raises(ValueError):
+        await coordinator.async_write({SwegonObjectId.TEMPERATURE_SUPPLY: 20})
+
+    assert simulator.requests["write"] == 0
+
+
+async def test_listeners_called_for_changed_objects(
+    coordinator: SwegonCasaDataUpdateCoordinator, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a listener is only called back when one of its objects changed."""
+    calls: list[str] = []
+    for object_id in (SwegonObjectId.TEMPERATURE_ROOM, SwegonObjectId.CLIMATE_MODE):
+        coordinator.async_add_listener(
+            lambda object_id=object_id: calls.append(object_id),
+            frozenset({object_id}),
+        )
+    coordinator.async_add_listener(lambda: calls.append("all"))
+
+    simulator.values[SwegonObjectId.TEMPERATURE_ROOM] = 22.4
+    await coordinator.async_refresh()
+
+    assert calls == [SwegonObjectId.TEMPERATURE_ROOM, "all"]
+    assert coordinator.data.changed == {SwegonObjectId.TEMPERATURE_ROOM}
+
+    calls.clear()
+    await coordinator.async_refresh()
+
+    assert calls == ["all"]
+
+
+async def test_snapshot_saved_and_restored(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: SwegonCasaDataUpdateCoordinator,
+    client: SwegonCasaClient,
+    simulator: SwegonCasaSimulator,
+) -> None:
+    """Test the last snapshot is saved on shutdown and shown after a restart."""
+    await coordinator.async_shutdown()
+
+    restarted = _create_coordinator(hass, entry, client)
+    assert await restarted.async_restore_snapshot()
+
+    assert restarted.data == simulator.values
+    assert restarted.data.timestamp < time.monotonic()
+
+
+async def test_old_snapshot_not_restored(
+    hass: HomeAssistant, entry: ConfigEntry, client: SwegonCasaClient
+) -> None:
+    """Test a snapshot read more than a day ago is not shown."""
+    store: Store[dict] = Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshot"
+    )
+    await store.async_save(
+        {"read_at": time.time() - 2 * 86400, "values": {SwegonObjectId.TRAVEL_MODE: 0}}
+    )
+
+    coordinator = _create_coordinator(hass, entry, client)
+
+    assert not await coordinator.async_restore_snapshot()
+    assert coordinator.data is None
+
+
+async def test_refresh_during_poll_runs_after_it(
+    coordinator: SwegonCasaDataUpdateCoordinator, simulator: SwegonCasaSimulator
+) -> None:
+    """Test refreshes requested during a poll share one poll run after it."""
+    simulator.latency = 0.05
+    reads = simulator.requests["read"]
+    running = asyncio.create_task(coordinator.async_refresh())
+    await asyncio.sleep(0.01)
+    simulator.values[SwegonObjectId.TEMPERATURE_ROOM] = 22.4
+
+    await asyncio.gather(
+        running, coordinator.async_refresh(), coordinator.async_refresh()
+    )
+
+    assert simulator.requests["read"] == reads + 2
+    assert coordinator.data[SwegonObjectId.TEMPERATURE_ROOM] == 22.4
+
+
+async def test_polls_follow_adaptive_interval(
+    coordinator: SwegonCasaDataUpdateCoordinator, simulator: SwegonCasaSimulator
+) -> None:
+    """Test polls run while listened to, without counting interval changes as misses."""
+    coordinator.poll_interval = AdaptivePollInterval(0.02, 0.08, backoff=2.0)
+    reads = simulator.requests["read"]
+
+    remove_listener = coordinator.async_add_listener(lambda: None)
+    assert coordinator.next_poll_in is not None
+    await asyncio.sleep(0.3)
+    remove_listener()
+
+    assert simulator.requests["read"] > reads + 2
+    assert coordinator.poll_interval.interval == 0.08
+    assert coordinator.skipped_ticks == 0
+    assert coordinator.next_poll_in is None
+
+
+async def test_cancelled_write_not_rolled_back(
+    coordinator: SwegonCasaDataUpdateCoordinator,
+    client: SwegonCasaClient,
+    simulator: SwegonCasaSimulator,
+) -> None:
+    """Test a cancelled caller leaves the written value shown while it is sent."""
+    client.write_coalesce_window = 0.05
+    write = asyncio.create_task(
+        coordinator.async_write({SwegonObjectId.FIREPLACE_MODE: 1})
+    )
+    await asyncio.sleep(0)
+    write.cancel()
+    await asyncio.gather(write, return_exceptions=True)
+
+    assert coordinator.data[SwegonObjectId.FIREPLACE_MODE] == 1
+
+    await asyncio.sleep(0.1)
+    assert simulator.values[SwegonObjectId.FIREPLACE_MODE] == 1
+    assert coordinator.data[SwegonObjectId.FIREPLACE_MODE] == 1
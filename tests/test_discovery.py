@@ -0,0 +1,44 @@
+"""Tests for the Swegon Casa object discovery."""
+
+from simulator import SwegonCasaSimulator
+
+from custom_components.swegon_casa.client import SwegonCasaClient
+from custom_components.swegon_casa.discovery import async_scan_objects
+
+
+async def test_scan_finds_readable_objects(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a scan returns every object with a value, in few requests."""
+    simulator.values["512"] = 7
+
+    found = await async_scan_objects(client, [str(i) for i in range(1024)])
+
+    assert found == simulator.values
+    assert simulator.requests["read"] == 6
+
+
+async def test_scan_adapts_batch_size(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test batches the unit refuses are split until it accepts them."""
+    simulator.max_objects = 20
+
+    found = await async_scan_objects(
+        client, [str(i) for i in range(300)], batch_size=64
+    )
+
+    assert found == simulator.values
+    assert simulator.requests["read"] < 40
+
+
+async def test_scan_aborted_when_login_fails(
+    client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test a scan the unit stops answering returns nothing instead of a partial result."""
+    assert await client.login()
+    simulator.password = "changed"
+    simulator.expire_sessions()
+
+    assert await async_scan_objects(client, [str(i) for i in range(300)]) is None
+    assert simulator.requests["read"] == 1
@@ -0,0 +1,74 @@
+"""Tests for polling a fleet of Swegon Casa units."""
+
+from collections.abc import AsyncIterator
+
+import pytest
+from simulator import SwegonCasaSimulator
+
+from custom_components.swegon_casa.client import SwegonCasaClient
+from custom_components.swegon_casa.fleet import SwegonCasaFleet
+
+
+@pytest.fixture
+async def simulators() -> AsyncIterator[list[SwegonCasaSimulator]]:
+    """Run several simulated units with some latency."""
+    sims = [SwegonCasaSimulator(latency=0.05) for _ in range(4)]
+    for sim in sims:
+        await sim.start()
+    yield sims
+    for sim in sims:
+        await sim.stop()
+
+
+async def test_poll_all_bounded_concurrency(
+    simulators: list[SwegonCasaSimulator],
+) -> None:
+    """Test every unit is polled with at most the configured concurrency."""
+    fleet = SwegonCasaFleet(max_concurrency=2, stagger=0)
+    clients = [
+        SwegonCasaClient(sim.host, sim.username, sim.password) for sim in simulators
+    ]
+    for index, client in enumerate(clients):
+        client.create_session()
+        fleet.add_unit(str(index), client)
+
+    try:
+        in_flight = 0
+        peak = 0
+        original = SwegonCasaClient.fetch_data
+
+        async def tracking_fetch(
+            client: SwegonCasaClient, read_ids: object = None
+        ) -> object:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                return await original(client, read_ids)
+            finally:
+                in_flight -= 1
+
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(SwegonCasaClient, "fetch_data", tracking_fetch)
+            results = await fleet.poll_all()
+    finally:
+        for client in clients:
+            await client.close()
+
+    assert peak == 2
+    assert all(data for data in results.values())
+    assert set(fleet.latencies) == set(results)
+
+
+def test_start_offsets_within_stagger() -> None:
+    """Test units get start offsets spread over the stagger window."""
+    fleet = SwegonCasaFleet(stagger=5)
+    for index in range(20):
+        fleet.add_unit(str(index), SwegonCasaClient("host", "user", "pass"))
+
+    offsets = [fleet.start_offset(key) for key in fleet.units]
+    fleet.remove_unit("0")
+
+    assert all(0 <= offset <= 5 for offset in offsets)
+    assert len(set(offsets)) > 1
+    assert "0" not in fleet.units
@@ -0,0 +1,22 @@
+"""Tests for the Swegon Casa object tables."""
+
+from custom_components.swegon_casa.lib import (
+    CLIMATE_MODE_CODES,
+    FIREPLACE_MODE_CODES,
+    ClimateModes,
+)
+
+
+def test_mode_codes_round_trip() -> None:
+    """Test every option maps to its code and back, in enum order."""
+    assert CLIMATE_MODE_CODES.options == tuple(mode.value for mode in ClimateModes)
+    assert CLIMATE_MODE_CODES.code(ClimateModes.AWAY) == 1
+    assert CLIMATE_MODE_CODES.code(ClimateModes.FIREPLACE) == 6
+    for option in CLIMATE_MODE_CODES.options:
+        assert CLIMATE_MODE_CODES.option(CLIMATE_MODE_CODES.code(option)) == option
+
+
+def test_mode_codes_unknown_code() -> None:
+    """Test codes from the unit are matched as numbers, unknown ones as None."""
+    assert FIREPLACE_MODE_CODES.option(1.0) == "On"
+    assert FIREPLACE_MODE_CODES.option(7) is None
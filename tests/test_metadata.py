@@ -0,0 +1,71 @@
+"""Tests for the Swegon Casa object metadata."""
+
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from simulator import SwegonCasaSimulator
+
+from custom_components.swegon_casa.client import SwegonCasaClient
+from custom_components.swegon_casa.const import DOMAIN
+from custom_components.swegon_casa.lib import SwegonObjectId
+from custom_components.swegon_casa.metadata import (
+    STORAGE_VERSION,
+    SwegonCasaMetadata,
+)
+
+
+async def test_load_reads_nothing_from_unit(
+    hass: HomeAssistant, client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test loading only takes the cache, leaving missing objects for later."""
+    metadata = SwegonCasaMetadata(hass, "entry", client)
+
+    await metadata.async_load([SwegonObjectId.CLIMATE_MODE], simulator.firmware)
+
+    assert metadata.objects == {}
+    assert metadata.missing == [SwegonObjectId.CLIMATE_MODE]
+    assert not simulator.requests
+
+    await metadata.async_read_missing()
+
+    assert metadata.objects[SwegonObjectId.CLIMATE_MODE]["77"] == "Operating mode"
+    assert metadata.missing == []
+
+
+async def test_units_with_same_firmware_share_cache(
+    hass: HomeAssistant, client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test units on one firmware add to its cache instead of saving over it."""
+    first = SwegonCasaMetadata(hass, "first", client)
+    second = SwegonCasaMetadata(hass, "second", client)
+    await first.async_load([SwegonObjectId.CLIMATE_MODE], simulator.firmware)
+    await second.async_load([SwegonObjectId.TEMPERATURE_SUPPLY], simulator.firmware)
+
+    await first.async_read_missing()
+    await second.async_read_missing()
+
+    store: Store[dict] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.metadata.2_4_1")
+    saved = await store.async_load()
+    assert saved is not None
+    assert saved.keys() == {
+        SwegonObjectId.CLIMATE_MODE,
+        SwegonObjectId.TEMPERATURE_SUPPLY,
+    }
+
+
+async def test_limits_and_units(
+    hass: HomeAssistant, client: SwegonCasaClient, simulator: SwegonCasaSimulator
+) -> None:
+    """Test limits and units are taken from the metadata the unit reports."""
+    metadata = SwegonCasaMetadata(hass, "entry", client)
+    setpoint = SwegonObjectId.SETPOINT_SUPPLY_TEMPERATURE
+    await metadata.async_load([setpoint, SwegonObjectId.CLIMATE_MODE], None)
+
+    assert metadata.limits(setpoint) == (None, None)
+    assert metadata.unit(setpoint) is None
+
+    await metadata.async_read_missing()
+
+    assert metadata.limits(setpoint) == (13, 25)
+    assert metadata.unit(setpoint) == UnitOfTemperature.CELSIUS
+    assert metadata.unit(SwegonObjectId.CLIMATE_MODE) is None
@@ -0,0 +1,49 @@
+"""Tests for the Swegon Casa retry policy and circuit breaker."""
+
+from unittest.mock import patch
+
+from custom_components.swegon_casa.resilience import (
+    CircuitBreaker,
+    CircuitState,
+    RetryPolicy,
+)
+
+
+def test_retry_delay_backs_off_with_jitter() -> None:
+    """Test retry delays double up to the maximum, less up to the jitter."""
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0, jitter=0.5)
+
+    with patch("random.random", return_value=0.0):
+        assert [policy.delay(retry) for retry in range(4)] == [0.5, 1.0, 2.0, 3.0]
+    with patch("random.random", return_value=1.0):
+        assert policy.delay(1) == 0.5
+
+
+def test_circuit_opens_probes_and_closes() -> None:
+    """Test the circuit opens after repeated failures and closes on recovery."""
+    now = 0.0
+    breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout=10, max_reset_timeout=15, clock=lambda: now
+    )
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    now = 10.0
+    assert breaker.allow_request()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.retry_at == 25.0
+
+    now = 25.0
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failures == 0
+    assert breaker.open_timeout == 10
@@ -0,0 +1,55 @@
+"""Tests for Swegon Casa poll scheduling."""
+
+from custom_components.swegon_casa.scheduler import (
+    AdaptivePollInterval,
+    next_fixed_rate_tick,
+)
+
+
+def test_backs_off_while_steady() -> None:
+    """Test the interval grows geometrically up to the ceiling."""
+    interval = AdaptivePollInterval(10, 60, backoff=2.0)
+    data = {"17": 19.5, "111": 2}
+
+    assert interval.observe(data) == 10
+    assert [interval.observe(data) for _ in range(4)] == [20, 40, 60, 60]
+
+
+def test_change_beyond_deadband_polls_fast() -> None:
+    """Test a value leaving its deadband resets the interval."""
+    interval = AdaptivePollInterval(10, 60, backoff=2.0, deadbands={"17": 0.5})
+    interval.observe({"17": 19.5, "111": 2})
+
+    assert interval.observe({"17": 19.8, "111": 2}) == 20
+    assert interval.observe({"17": 20.1, "111": 2}) == 10
+    assert interval.observe({"17": 20.1, "111": 3}) == 10
+
+
+def test_slow_drift_is_measured_from_last_change() -> None:
+    """Test small steps add up against the last reading that moved."""
+    interval = AdaptivePollInterval(10, 60, backoff=2.0, deadbands={"17": 0.5})
+    interval.observe({"17": 19.5})
+
+    assert interval.observe({"17": 19.8}) == 20
+    assert interval.observe({"17": 20.1}) == 10
+
+
+def test_write_polls_fast() -> None:
+    """Test a write resets the interval."""
+    interval = AdaptivePollInterval(10, 60, backoff=2.0)
+    for _ in range(5):
+        interval.observe({"111": 2})
+
+    assert interval.notify_write() == 10
+    assert interval.interval == 10
+
+
+def test_fixed_rate_tick_on_schedule() -> None:
+    """Test the next tick is one interval after the last one."""
+    assert next_fixed_rate_tick(100.0, 30.0, 112.0) == (130.0, 0)
+
+
+def test_fixed_rate_tick_skips_missed_ticks() -> None:
+    """Test ticks missed by a slow poll are skipped, not piled up."""
+    assert next_fixed_rate_tick(100.0, 30.0, 130.0) == (160.0, 1)
+    assert next_fixed_rate_tick(100.0, 30.0, 175.0) == (190.0, 2)
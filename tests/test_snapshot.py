@@ -0,0 +1,50 @@
+"""Tests for the Swegon Casa snapshot."""
+
+import pytest
+
+from custom_components.swegon_casa.snapshot import SwegonCasaSnapshot
+
+
+def test_snapshot_is_a_mapping() -> None:
+    """Test a snapshot reads like the dict it was built from."""
+    snapshot = SwegonCasaSnapshot({"17": 19.5, "111": 2}, timestamp=1.0)
+
+    assert snapshot == {"17": 19.5, "111": 2}
+    assert snapshot["17"] == 19.5
+    assert snapshot.get("18") is None
+    assert "111" in snapshot
+    assert snapshot.timestamp == 1.0
+    assert snapshot.changed is None
+
+
+def test_snapshot_is_read_only() -> None:
+    """Test the values, timestamp and changed objects cannot be assigned."""
+    snapshot = SwegonCasaSnapshot({"17": 19.5}, timestamp=1.0)
+
+    with pytest.raises(AttributeError):
+        snapshot.changed = frozenset({"17"})  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        snapshot.timestamp = 2.0  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        snapshot["17"] = 20.0  # type: ignore[index]
+
+
+def test_snapshot_compared_to_previous() -> None:
+    """Test only the objects that differ from the previous snapshot are changed."""
+    previous = SwegonCasaSnapshot({"17": 19.5, "111": 2})
+    snapshot = SwegonCasaSnapshot({"17": 19.5, "111": 3, "18": 21.2})
+
+    assert snapshot.compared_to(previous).changed == {"111", "18"}
+    assert snapshot.compared_to(None).changed is None
+
+
+def test_snapshot_replace() -> None:
+    """Test replacing values leaves the source alone and marks what differs."""
+    snapshot = SwegonCasaSnapshot({"17": 19.5, "111": 2})
+
+    replaced = snapshot.replace({"17": 19.5, "111": 3})
+
+    assert replaced == {"17": 19.5, "111": 3}
+    assert replaced.changed == {"111"}
+    assert snapshot["111"] == 2
+    assert snapshot.replace({"111": 2}) is snapshot